@@ -0,0 +1,172 @@
+import argparse
+import os
+import queue
+import time
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+from dataclasses import asdict
+from chaser_rl import RLAgent, QNetwork
+from vec_env import VecDroneEnv
+from utils.config import Config, add_config_args, load_config
+
+STATE_DIM = 9
+ACTION_DIM = 8
+ACTOR_SEED_STRIDE = 1_000_000  # actor i simulates episodes seed + i * stride + n
+
+
+def actor_loop(actor_id, shared_net, weights_lock, weights_version, transitions, env_steps, stop, envs_per_actor,
+               sync_every, seed=None, config=None):
+    """Run pursuit episodes and stream their transitions to the learner"""
+    config = config or Config()
+    transitions.cancel_join_thread()  # exit without flushing ticks the learner no longer wants
+    actor_seed = None if seed is None else seed + (actor_id + 1) * ACTOR_SEED_STRIDE
+    agent = RLAgent(state_dim=STATE_DIM, action_dim=ACTION_DIM, seed=actor_seed,
+                    **dict(asdict(config.agent), num_threads=1))
+    local_version = -1
+    vec_env = VecDroneEnv(envs_per_actor, agent, seed=actor_seed, config=config)
+    vec_env.reset()
+
+    step = 0
+    while not stop.is_set():
+        if step % sync_every == 0 and weights_version.value != local_version:
+            with weights_lock:
+                local_version = weights_version.value
+                agent.q_net.load_state_dict(shared_net.state_dict())
+
+        _, _, _, info = vec_env.step()
+        valid = info['valid']
+        dones = np.broadcast_to(info['captured'][:, None], valid.shape)
+        batch = (info['states'][valid], info['actions'][valid], info['rewards'][valid],
+                 info['next_states'][valid], dones[valid].astype(np.float32))
+        episodes = [dict(ep, actor=actor_id) for ep in info['episodes']]
+        # Wait for room rather than drop the tick: the learner counts episodes and steps from these
+        while True:
+            try:
+                transitions.put((batch, episodes), timeout=1.0)
+                break
+            except queue.Full:
+                if stop.is_set():
+                    return
+
+        step += 1
+        with env_steps.get_lock():
+            env_steps.value += envs_per_actor
+
+
+def _check_actors(actors):
+    """Raise if an actor has exited; actors only return after the learner sets stop"""
+    for i, p in enumerate(actors):
+        if p.exitcode is not None:
+            raise RuntimeError(f"actor {i} exited with code {p.exitcode}")
+
+
+def run(num_actors=4, num_episodes=200, envs_per_actor=1, sync_every=50, publish_every=100, report_every=5.0,
+        seed=None, out_path="model/actor_learner_final.pth", config=None):
+    """Learner: owns the replay buffer and optimizer, actors only simulate; the final weights go to out_path"""
+    config = config or Config()
+    ctx = mp.get_context("spawn")
+    agent = RLAgent(state_dim=STATE_DIM, action_dim=ACTION_DIM, seed=seed, **asdict(config.agent))
+
+    shared_net = QNetwork(STATE_DIM, ACTION_DIM)
+    shared_net.load_state_dict(agent.q_net.state_dict())
+    shared_net.share_memory()
+    weights_lock = ctx.Lock()
+    weights_version = ctx.Value('i', 0)
+    env_steps = ctx.Value('q', 0)
+    transitions = ctx.Queue(maxsize=num_actors * 64)
+    stop = ctx.Event()
+
+    actors = [ctx.Process(target=actor_loop,
+                          args=(i, shared_net, weights_lock, weights_version, transitions, env_steps, stop,
+                                envs_per_actor, sync_every, seed, config),
+                          daemon=True)
+              for i in range(num_actors)]
+    for p in actors:
+        p.start()
+
+    completed = 0
+    grad_steps = 0
+    start = last_report = time.time()
+    last_env_steps = last_grad_steps = 0
+    try:
+        while completed < num_episodes:
+            # Drain whatever the actors produced since the last gradient step,
+            # only blocking while the replay buffer is still too small to train
+            drained = 0
+            while drained < num_actors * 8:
+                try:
+                    if len(agent.memory) < agent.batch_size:
+                        batch, episodes = transitions.get(timeout=0.1)
+                    else:
+                        batch, episodes = transitions.get_nowait()
+                except queue.Empty:
+                    _check_actors(actors)
+                    break
+                if len(batch[0]):
+                    agent.store_experiences(*batch)
+                for ep in episodes:
+                    completed += 1
+                    print(f"Episode {completed} (actor {ep['actor']}), Reward: {ep['total_reward']:.2f}")
+                drained += 1
+
+            if len(agent.memory) >= agent.batch_size:
+                agent.train()
+                grad_steps += 1
+                if grad_steps % publish_every == 0:
+                    with weights_lock, torch.no_grad():
+                        for shared, param in zip(shared_net.parameters(), agent.q_net.parameters()):
+                            shared.copy_(param)
+                        weights_version.value += 1
+
+            now = time.time()
+            if now - last_report >= report_every:
+                dt = now - last_report
+                print(f"[learner] {(grad_steps - last_grad_steps) / dt:.0f} grad steps/s | "
+                      f"[actors] {(env_steps.value - last_env_steps) / dt:.0f} env steps/s | "
+                      f"replay {len(agent.memory)}")
+                last_report, last_grad_steps, last_env_steps = now, grad_steps, env_steps.value
+    finally:
+        stop.set()
+        # Keep draining so no actor stays blocked in put() while we wait for it
+        deadline = time.time() + 5
+        while any(p.is_alive() for p in actors) and time.time() < deadline:
+            try:
+                transitions.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for p in actors:
+            if p.is_alive():
+                p.terminate()
+            p.join()
+
+    elapsed = time.time() - start
+    print(f"Learner: {grad_steps} grad steps ({grad_steps / elapsed:.0f}/s), "
+          f"actors: {env_steps.value} env steps ({env_steps.value / elapsed:.0f}/s) in {elapsed:.1f}s")
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    agent.save(out_path)
+    return agent
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Actor/learner DQN training across processes",
+                                     epilog="--batch-size, --learner-threads and --bf16 override the config.")
+    add_config_args(parser)
+    parser.add_argument("--actors", type=int, default=4)
+    parser.add_argument("--episodes", type=int, default=200)
+    parser.add_argument("--envs-per-actor", type=int, default=1)
+    parser.add_argument("--sync-every", type=int, default=50,
+                        help="actor steps between weight syncs")
+    parser.add_argument("--publish-every", type=int, default=100,
+                        help="learner gradient steps between weight publishes")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--learner-threads", type=int, default=None,
+                        help="torch intra-op threads for the learner process")
+    parser.add_argument("--bf16", action="store_true", default=None, help="bfloat16 autocast in the learner")
+    parser.add_argument("--out", default="model/actor_learner_final.pth", help="where to save the final weights")
+    args = parser.parse_args()
+    flags = {'agent.batch_size': args.batch_size, 'agent.num_threads': args.learner_threads, 'agent.bf16': args.bf16}
+    overrides = list(args.overrides) + [f"{key}={value}" for key, value in flags.items() if value is not None]
+    run(args.actors, args.episodes, args.envs_per_actor, args.sync_every, args.publish_every,
+        seed=args.seed, out_path=args.out, config=load_config(args.config, overrides))
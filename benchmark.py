@@ -0,0 +1,282 @@
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import numpy as np
+import torch
+import pygame
+from drone_env import DroneEnv
+from runner import Runner
+from chaser_intelligent import ChaserIntelligent
+from chaser_rl import RLAgent
+from replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
+from spatial_index import SpatialHash
+from swarm_core import SwarmState, step_runners, step_intelligent_chasers
+from phase_timer import PhaseTimer
+from main_rl import initialize_simulation, simulate_step, compute_rewards, has_transition
+from utils.params import WIDTH, HEIGHT, BORDER_MARGIN, SENSE_RADIUS
+
+STATE_DIM = 9
+ACTION_DIM = 8
+CHASER_COUNTS = [3, 10, 50, 100, 500]
+RUNNER_COUNTS = [1, 10, 50]
+BUFFER_SIZES = [1000, 10000, 100000]
+
+
+def build_swarm(num_chasers, num_runners, rng):
+    """DroneEnv with chasers and runners spawned uniformly inside the borders"""
+    def spawn():
+        return (rng.uniform(BORDER_MARGIN, WIDTH - BORDER_MARGIN),
+                rng.uniform(BORDER_MARGIN, HEIGHT - BORDER_MARGIN))
+    env = DroneEnv(WIDTH, HEIGHT, SENSE_RADIUS)
+    chasers = [ChaserIntelligent(*spawn(), None, rng) for _ in range(num_chasers)]
+    runners = [Runner(*spawn(), rng) for _ in range(num_runners)]
+    return env, runners, chasers
+
+
+def bench_simulation(num_chasers, num_runners, steps, seed):
+    """Per-component latency of the object-based simulation.
+
+    Chasers track the first runner (the entity API is single-runner); the
+    others only move. One env step is one tick of the whole swarm.
+    """
+    rng = random.Random(seed)
+    env, runners, chasers = build_swarm(num_chasers, num_runners, rng)
+    runner = runners[0]
+    others = [[c for c in chasers if c is not chaser] for chaser in chasers]
+    index = SpatialHash(SENSE_RADIUS)
+    timings = PhaseTimer()
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        with timings.span('tick'):
+            with timings.span('spatial_hash_build'):
+                index.build(chasers)
+            for chaser, rest in zip(chasers, others):
+                with timings.span('get_state'):
+                    env.get_state(chaser, runner, rest, index)
+            with timings.span('get_states'):
+                env.get_states(chasers, runner)
+            for chaser, rest in zip(chasers, others):
+                with timings.span('chaser_update'):
+                    chaser.update(env, runner, rest)
+            with timings.span('mark_visited'):
+                env.mark_visited(np.array([(c.pos.x, c.pos.y) for c in chasers]))
+            for r in runners:
+                with timings.span('runner_update'):
+                    r.update_random()
+            for chaser, rest in zip(chasers, others):
+                with timings.span('get_reward'):
+                    env.get_reward(chaser, runner, rest)
+    elapsed = time.perf_counter() - start
+    return {'chasers': num_chasers, 'runners': num_runners, 'steps': steps,
+            'env_steps_per_s': steps / elapsed, 'agent_steps_per_s': steps * num_chasers / elapsed,
+            'latency': timings.stats()}
+
+
+def bench_swarm_core(num_chasers, num_runners, steps, seed):
+    """Latency of the vectorized swarm_core step functions at the same sizes"""
+    rng = np.random.default_rng(seed)
+    chasers = SwarmState.random(num_chasers, rng)
+    runners = SwarmState.random(num_runners, rng)
+    targets = np.column_stack([rng.uniform(0, WIDTH, num_chasers), rng.uniform(0, HEIGHT, num_chasers)])
+    timings = PhaseTimer()
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        with timings.span('tick'):
+            with timings.span('step_intelligent_chasers'):
+                step_intelligent_chasers(chasers, runners.pos[0], targets)
+            with timings.span('step_runners'):
+                step_runners(runners, rng)
+    elapsed = time.perf_counter() - start
+    return {'chasers': num_chasers, 'runners': num_runners, 'steps': steps,
+            'env_steps_per_s': steps / elapsed, 'agent_steps_per_s': steps * num_chasers / elapsed,
+            'latency': timings.stats()}
+
+
+def bench_inference(num_chasers, steps, seed):
+    """Per-tick action selection for a swarm sharing one agent: per-chaser calls vs one batch"""
+    agent = RLAgent(STATE_DIM, ACTION_DIM, seed=seed)
+    agent.epsilon = agent.epsilon_min
+    states = np.random.default_rng(seed).standard_normal((num_chasers, STATE_DIM)).astype(np.float32)
+    timings = PhaseTimer()
+    for _ in range(steps):
+        with timings.span('select_action_loop'):
+            for state in states:
+                agent.select_action(state)
+        with timings.span('select_actions'):
+            agent.select_actions(states)
+    stats = timings.stats()
+    return {'chasers': num_chasers, 'steps': steps,
+            'loop_ticks_per_s': 1e3 / stats['select_action_loop']['mean_ms'],
+            'batched_ticks_per_s': 1e3 / stats['select_actions']['mean_ms'],
+            'latency': stats}
+
+
+def bench_training(buffer_size, grad_steps, seed, prioritized=False, warmup=10, batch_size=64, bf16=False):
+    """RLAgent.train throughput with a full replay buffer of the given size"""
+    agent = RLAgent(STATE_DIM, ACTION_DIM, prioritized=prioritized, seed=seed, batch_size=batch_size, bf16=bf16)
+    if prioritized:
+        agent.memory = PrioritizedReplayBuffer(buffer_size, STATE_DIM, seed=seed)
+    else:
+        agent.memory = ReplayBuffer(buffer_size, STATE_DIM, seed=seed)
+
+    rng = np.random.default_rng(seed)
+    states = rng.standard_normal((buffer_size, STATE_DIM)).astype(np.float32)
+    actions = rng.integers(0, ACTION_DIM, buffer_size)
+    rewards = rng.standard_normal(buffer_size).astype(np.float32)
+    next_states = rng.standard_normal((buffer_size, STATE_DIM)).astype(np.float32)
+    dones = (rng.random(buffer_size) < 0.01).astype(np.float32)
+    fill_start = time.perf_counter()
+    agent.memory.add_batch(states, actions, rewards, next_states, dones)
+    fill_elapsed = time.perf_counter() - fill_start
+
+    for _ in range(warmup):
+        agent.train()
+    timings = PhaseTimer()
+    start = time.perf_counter()
+    for _ in range(grad_steps):
+        with timings.span('train'):
+            agent.train()
+    elapsed = time.perf_counter() - start
+    return {'buffer_size': buffer_size, 'prioritized': prioritized, 'batch_size': agent.batch_size,
+            'bf16': bf16, 'grad_steps': grad_steps, 'grad_steps_per_s': grad_steps / elapsed,
+            'samples_per_s': grad_steps * agent.batch_size / elapsed,
+            'insert_per_s': buffer_size / fill_elapsed, 'latency': timings.stats()}
+
+
+def bench_training_loop(steps, seed):
+    """The main_rl tick (simulate, store, train) on the standard 3-chaser scenario"""
+    agent = RLAgent(STATE_DIM, ACTION_DIM, seed=seed)
+    episode_seed = seed
+    env, runner, chasers = initialize_simulation(agent, episode_seed)
+    timings = PhaseTimer()
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        with timings.span('tick'):
+            with timings.span('simulate_step'):
+                _, capturing_index, _ = simulate_step(env, runner, chasers)
+            with timings.span('store'):
+                next_states = env.get_states(chasers, runner)
+                rewards = compute_rewards(env, runner, chasers, capturing_index)
+                for i, chaser in enumerate(chasers):
+                    if has_transition(chaser):
+                        agent.store_experience(chaser.last_state, chaser.last_action, rewards[i],
+                                               next_states[i], capturing_index is not None)
+            with timings.span('train'):
+                agent.train()
+        if capturing_index is not None:
+            episode_seed += 1
+            env, runner, chasers = initialize_simulation(agent, episode_seed)
+    elapsed = time.perf_counter() - start
+    return {'steps': steps, 'env_steps_per_s': steps / elapsed, 'latency': timings.stats()}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(chaser_counts=CHASER_COUNTS, runner_counts=RUNNER_COUNTS, buffer_sizes=BUFFER_SIZES,
+        sim_steps=50, grad_steps=200, loop_steps=500, seed=0, batch_size=64, bf16=False):
+    """Run every benchmark and return the results as one JSON-serializable dict"""
+    results = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seed': seed,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'torch': torch.__version__,
+            'pygame': pygame.version.ver,
+            'torch_threads': torch.get_num_threads(),
+            'machine': platform.platform(),
+        },
+        'simulation': [], 'swarm_core': [], 'inference': [], 'training': [],
+    }
+    for num_chasers in chaser_counts:
+        for num_runners in runner_counts:
+            for name, bench in (('simulation', bench_simulation), ('swarm_core', bench_swarm_core)):
+                result = bench(num_chasers, num_runners, sim_steps, seed)
+                results[name].append(result)
+                print(f"{name:<12} chasers={num_chasers:<4} runners={num_runners:<3} "
+                      f"{result['env_steps_per_s']:>10.1f} env steps/s")
+    for num_chasers in chaser_counts:
+        result = bench_inference(num_chasers, sim_steps, seed)
+        results['inference'].append(result)
+        print(f"{'inference':<12} chasers={num_chasers:<4} {result['loop_ticks_per_s']:>10.1f} -> "
+              f"{result['batched_ticks_per_s']:.1f} ticks/s batched")
+    for buffer_size in buffer_sizes:
+        for prioritized in (False, True):
+            result = bench_training(buffer_size, grad_steps, seed, prioritized, batch_size=batch_size, bf16=bf16)
+            results['training'].append(result)
+            print(f"{'training':<12} buffer={buffer_size:<7} per={int(prioritized)} "
+                  f"{result['grad_steps_per_s']:>10.1f} grad steps/s")
+    results['training_loop'] = bench_training_loop(loop_steps, seed)
+    print(f"{'train loop':<12} {results['training_loop']['env_steps_per_s']:>31.1f} env steps/s")
+    return results
+
+
+def _throughputs(results):
+    """{(section, config): steps/s} for comparing two result files"""
+    rates = {}
+    for section in ('simulation', 'swarm_core'):
+        for r in results.get(section, []):
+            rates[(section, f"chasers={r['chasers']} runners={r['runners']}")] = r['env_steps_per_s']
+    for r in results.get('inference', []):
+        rates[('inference', f"chasers={r['chasers']}")] = r['batched_ticks_per_s']
+    for r in results.get('training', []):
+        rates[('training', f"buffer={r['buffer_size']} per={int(r['prioritized'])}")] = r['grad_steps_per_s']
+    if 'training_loop' in results:
+        rates[('training_loop', '')] = results['training_loop']['env_steps_per_s']
+    return rates
+
+
+def compare(baseline, current, tolerance=0.2):
+    """Print throughput changes against a baseline; returns the configs slower by more than tolerance"""
+    old, new = _throughputs(baseline), _throughputs(current)
+    regressions = []
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key] / old[key]
+        flag = ''
+        if ratio < 1 - tolerance:
+            flag = '  REGRESSION'
+            regressions.append(key)
+        print(f"{key[0]:<14} {key[1]:<24} {old[key]:>10.1f} -> {new[key]:>10.1f} ({ratio:.2f}x){flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless, fixed-seed simulation and training benchmarks")
+    parser.add_argument("--chasers", type=int, nargs="+", default=CHASER_COUNTS)
+    parser.add_argument("--runners", type=int, nargs="+", default=RUNNER_COUNTS)
+    parser.add_argument("--buffer-sizes", type=int, nargs="+", default=BUFFER_SIZES)
+    parser.add_argument("--sim-steps", type=int, default=50, help="ticks per simulation benchmark")
+    parser.add_argument("--grad-steps", type=int, default=200, help="train() calls per buffer size")
+    parser.add_argument("--loop-steps", type=int, default=500, help="ticks of the full training loop")
+    parser.add_argument("--batch-size", type=int, default=64, help="training batch size")
+    parser.add_argument("--bf16", action="store_true", help="train under bfloat16 autocast")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmark.json", help="where to write the JSON results")
+    parser.add_argument("--compare", default=None, help="baseline JSON to report regressions against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    results = run(args.chasers, args.runners, args.buffer_sizes, args.sim_steps, args.grad_steps,
+                  args.loop_steps, args.seed, args.batch_size, args.bf16)
+    with open(args.out, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, results, args.tolerance):
+            raise SystemExit(1)
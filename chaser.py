@@ -5,14 +5,15 @@ import math
 import random
 
 class Chaser:
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=None):
+        self.rng = rng or random  # random.Random for reproducible runs
         self.pos = pygame.Vector2(x, y)
         self.color = (0, 100, 255)  # Blue
         self.radius = 12
         self.speed = CHASER_SPEED
         self.capture_radius = 25  # Pixels
 
-        self.velocity = pygame.Vector2(random.uniform(-1, 1), random.uniform(-1, 1)).normalize() * 0.5
+        self.velocity = pygame.Vector2(self.rng.uniform(-1, 1), self.rng.uniform(-1, 1)).normalize() * 0.5
         self.target_velocity = self.velocity.copy()
         self.max_speed = CHASER_SPEED
         self.steering_strength = 0.05 
@@ -20,10 +21,23 @@ class Chaser:
         self.mode = "exploration"
 
     def _get_new_wander_direction(self):
-        angle_change = random.gauss(0, 20) * (1 - self.wander_smoothness)
+        angle_change = self.rng.gauss(0, 20) * (1 - self.wander_smoothness)
         return self.target_velocity.rotate(angle_change).normalize()
 
-    def update_simple(self, runner_pos, runner_visible, chasers):
+    def _repulsion(self, chasers, radius, index=None):
+        """Sum of offset / dist**2 from chasers closer than radius"""
+        if index is not None:
+            chasers = index.query_radius(self.pos, radius, exclude=self)
+        repulsion = pygame.Vector2(0, 0)
+        for other in chasers:
+            if other is not self:
+                offset = self.pos - other.pos
+                dist = offset.length()
+                if 0 < dist < radius:
+                    repulsion += offset / (dist**2)
+        return repulsion
+
+    def update_simple(self, runner_pos, runner_visible, chasers, index=None):
         if runner_visible:
             # Proportional pursuit
             self.mode = "pursuit"
@@ -32,16 +46,10 @@ class Chaser:
         else:
             # Gradually change wander direction
             self.mode = "exploration"
-            if random.random() < 0.1:
+            if self.rng.random() < 0.1:
                 self.target_velocity = self._get_new_wander_direction() * self.max_speed
 
-            repulsion = pygame.Vector2(0, 0)
-            for other in chasers:
-                if other is not self:
-                    offset = self.pos - other.pos
-                    dist = offset.length()
-                    if 0 < dist < SENSE_RADIUS:
-                        repulsion += offset / (dist**2)
+            repulsion = self._repulsion(chasers, SENSE_RADIUS, index)
             
             # Smooth transition toward new direction
             steer = self.target_velocity + repulsion * 100  # Tune strength as needed
@@ -59,7 +67,7 @@ class Chaser:
 
             self.pos += self.velocity
 
-    def update_hybrid_1(self, runner_pos, runner_visible, all_chasers):
+    def update_hybrid_1(self, runner_pos, runner_visible, all_chasers, index=None):
         neighbors = [c for c in all_chasers if c is not self]
 
         if runner_visible:
@@ -72,12 +80,7 @@ class Chaser:
             if self.last_runner_pos:
                 direction = (self.last_runner_pos - self.pos).normalize()
                 
-                repulsion = pygame.Vector2(0, 0)
-                for neighbor in neighbors:
-                    offset = self.pos - neighbor.pos
-                    dist = offset.length()
-                    if dist > 0 and dist < CHASER_SPACING:
-                        repulsion += offset / (dist ** 2)
+                repulsion = self._repulsion(neighbors, CHASER_SPACING, index)
 
                 combined = direction * self.max_speed + repulsion * 100
                 self.velocity += (combined - self.velocity) * self.steering_strength
@@ -89,16 +92,10 @@ class Chaser:
                 #     self.last_runner_pos = None
         else:
             self.mode = 'exploration'
-            if random.random() < 0.1:
+            if self.rng.random() < 0.1:
                 self.target_velocity = self._get_new_wander_direction() * self.max_speed
 
-            repulsion = pygame.Vector2(0, 0)
-            for other in all_chasers:
-                if other is not self:
-                    offset = self.pos - other.pos
-                    dist = offset.length()
-                    if 0 < dist < SENSE_RADIUS:
-                        repulsion += offset / (dist**2)
+            repulsion = self._repulsion(all_chasers, SENSE_RADIUS, index)
             
             # Smooth transition toward new direction
             steer = self.target_velocity + repulsion * 100  # Tune strength as needed
@@ -130,18 +127,19 @@ class Chaser:
         else:
             color = (173, 216, 230)  # Light blue (exploring)
 
-        pygame.draw.circle(surface, color, (int(self.pos.x), int(self.pos.y)), self.radius)
+        return pygame.draw.circle(surface, color, (int(self.pos.x), int(self.pos.y)), self.radius)
     
     def get_position(self):
         self.pos.copy()
 
-def create_triangular_formation(center, radius):
+def create_triangular_formation(center, radius, rng=None):
     """Creates 3 chasers in equilateral triangle formation"""
     chasers = []
     for angle in [30, 150, 270]:  # 120° separation
         chaser = Chaser(
             center.x + radius * math.cos(math.radians(angle)),
-            center.y + radius * math.sin(math.radians(angle))
+            center.y + radius * math.sin(math.radians(angle)),
+            rng
         )
         chaser.formation_offset = pygame.Vector2(
             radius * math.cos(math.radians(angle)),
@@ -153,5 +151,5 @@ def create_triangular_formation(center, radius):
 
 def draw_chaser_lines(screen, chasers):
     if len(chasers) >= 3:
-        pygame.draw.polygon(screen, GREEN, 
+        return pygame.draw.polygon(screen, GREEN, 
                           [(c.pos.x, c.pos.y) for c in chasers[:3]], 2)
\ No newline at end of file
@@ -3,46 +3,73 @@ import math
 import random
 import numpy as np
 from collections import defaultdict
-from utils.params import WIDTH, HEIGHT
+from utils.config import ChaserConfig, ArenaConfig
 
 class ChaserIntelligent:
-    def __init__(self, x, y, rl_agent):
+    def __init__(self, x, y, rl_agent, rng=None, config=None, arena=None):
+        self.config = config or ChaserConfig()
+        self.arena = arena or ArenaConfig()
+        self.rng = rng or random  # random.Random for reproducible runs
         self.pos = pygame.Vector2(x, y)
-        self.velocity = pygame.Vector2(random.uniform(-1, 1), random.uniform(-1, 1)).normalize() * 0.5
+        self.velocity = pygame.Vector2(self.rng.uniform(-1, 1), self.rng.uniform(-1, 1)).normalize() * 0.5
         self.target_velocity = self.velocity.copy()
-        self.radius = 15
-        self.speed = 2.5
-        self.max_speed = 3.5
-        self.steering_strength = 0.08
+        self.radius = self.config.radius
+        self.speed = self.config.speed
+        self.max_speed = self.config.max_speed
+        self.steering_strength = self.config.steering_strength
         self.mode = "exploration"
         self.rl_agent = rl_agent
         self.explore_target = None
         self.last_state = None
         self.last_action = None
         self.switch_cooldown = 0
-        self.exploration_cell_size = 30  # Smaller cells for smoother movement
         self.mode_switch = False
 
-    def update(self, env, runner, other_chasers):
-        state = env.get_state(self, runner, other_chasers)
+    @property
+    def max_step(self):
+        """Upper bound on the distance moved in one tick.
+
+        Steering only blends the velocity toward targets of at most
+        max_speed * max(pursuit_speed, explore_speed) and bounces shrink
+        it, so the speed never exceeds that or the initial 0.5.
+        """
+        return max(0.5, self.max_speed * max(self.config.pursuit_speed, self.config.explore_speed))
+
+    def update(self, env, runner, other_chasers, index=None, others_see_runner=None):
+        """Observe and act. other_chasers may be the whole swarm; this chaser is skipped.
+
+        others_see_runner is whether any other chaser's last observation
+        showed the runner; callers that track it per tick pass it to skip
+        the scan over other_chasers.
+        """
+        state = env.get_state(self, runner, other_chasers, index)
         
         # Check if any chaser can see the runner
-        swarm_sees_runner = (state[2] > 0.5) or any(
-            c.last_state is not None and c.last_state[2] > 0.5 
-            for c in other_chasers
-        )
+        if others_see_runner is None:
+            others_see_runner = any(
+                c is not self and c.last_state is not None and c.last_state[2] > 0.5 
+                for c in other_chasers
+            )
+        swarm_sees_runner = (state[2] > 0.5) or others_see_runner
+        self.act(env, state, swarm_sees_runner, runner)
+
+    def act(self, env, state, swarm_sees_runner, target):
+        """Switch mode and move, given this tick's observation.
 
+        target is the runner to pursue; with None (no runner known, e.g. in
+        a multi-runner scenario) the chaser explores even in pursuit mode.
+        """
         # Mode switching with cooldown
         if self.switch_cooldown <= 0:
             if swarm_sees_runner:
                 self.mode = "pursuit"
-                self.switch_cooldown = 30
+                self.switch_cooldown = self.config.pursuit_cooldown
             else:
                 self.mode = "exploration"
 
         # Execute behavior
-        if self.mode == "pursuit":
-            self._pursuit_behavior(runner)
+        if self.mode == "pursuit" and target is not None:
+            self._pursuit_behavior(target)
             self.last_action = -1
         else:
             self._explore(env)
@@ -57,47 +84,39 @@ class ChaserIntelligent:
     def _pursuit_behavior(self, runner):
         """Smooth pursuit with steering"""
         target_direction = (runner.pos - self.pos).normalize()
-        self.target_velocity = target_direction * self.max_speed * 1.2
+        self.target_velocity = target_direction * self.max_speed * self.config.pursuit_speed
         self._apply_steering()
 
     def _explore(self, env):
         """Improved randomized exploration"""
         if (self.explore_target is None or 
             env.get_visit_count(self.explore_target) > 1 or
-            self.pos.distance_to(self.explore_target) < 15):
+            self.pos.distance_to(self.explore_target) < self.config.arrival_radius):
             
-            # Get all unexplored cells in radius, then pick one randomly
-            unexplored = []
-            search_radius = 300
+            # Pick a random frontier cell (unexplored or visited once) in range,
+            # else the closest one anywhere on the map
+            frontier = env.exploration_map
+            target = frontier.random_frontier(self.pos, self.config.explore_radius,
+                                              min_radius=self.config.explore_min_radius, rng=self.rng)
+            if target is None:
+                target = frontier.nearest_frontier(self.pos)
             
-            # Check cells in spiral pattern for efficiency
-            for distance in range(50, int(search_radius), self.exploration_cell_size):
-                for angle in range(0, 360, 30):
-                    rad = math.radians(angle)
-                    cell_x = self.pos.x + math.cos(rad) * distance
-                    cell_y = self.pos.y + math.sin(rad) * distance
-                    cell_pos = pygame.Vector2(cell_x, cell_y)
-                    
-                    if self._is_within_bounds(cell_pos):
-                        visits = env.get_visit_count(cell_pos)
-                        if visits <= 1:  # Prioritize unexplored or visited once
-                            unexplored.append(cell_pos)
-            
-            # Random selection from available unexplored cells
-            if unexplored:
-                self.explore_target = random.choice(unexplored)
+            if target is not None:
+                self.explore_target = pygame.Vector2(target)
             else:
-                # Fallback to random position with central bias
+                # Whole map explored: random position with central bias
+                width, height = self.arena.width, self.arena.height
                 self.explore_target = pygame.Vector2(
-                    random.gauss(WIDTH/2, WIDTH/4),
-                    random.gauss(HEIGHT/2, HEIGHT/4)
+                    self.rng.gauss(width/2, width/4),
+                    self.rng.gauss(height/2, height/4)
                 )
-                self.explore_target.x = max(20, min(self.explore_target.x, WIDTH-20))
-                self.explore_target.y = max(20, min(self.explore_target.y, HEIGHT-20))
+                margin = self.arena.frontier_margin
+                self.explore_target.x = max(margin, min(self.explore_target.x, width-margin))
+                self.explore_target.y = max(margin, min(self.explore_target.y, height-margin))
         
         # Smooth movement toward target
-        if self.explore_target:
-            desired_velocity = (self.explore_target - self.pos).normalize() * self.max_speed * 0.8
+        if self.explore_target and self.explore_target != self.pos:
+            desired_velocity = (self.explore_target - self.pos).normalize() * self.max_speed * self.config.explore_speed
             self.target_velocity = desired_velocity
             self._apply_steering()
 
@@ -108,38 +127,42 @@ class ChaserIntelligent:
 
     def _enforce_bounds(self):
         """Strict border containment with bounce"""
-        border_margin = 15
-        bounce_factor = 0.8
+        border_margin = self.config.border_margin
+        bounce_factor = self.config.bounce
+        width, height = self.arena.width, self.arena.height
         
         if self.pos.x < border_margin:
             self.pos.x = border_margin
             self.velocity.x *= -bounce_factor
-        elif self.pos.x > WIDTH - border_margin:
-            self.pos.x = WIDTH - border_margin
+        elif self.pos.x > width - border_margin:
+            self.pos.x = width - border_margin
             self.velocity.x *= -bounce_factor
             
         if self.pos.y < border_margin:
             self.pos.y = border_margin
             self.velocity.y *= -bounce_factor
-        elif self.pos.y > HEIGHT - border_margin:
-            self.pos.y = HEIGHT - border_margin
+        elif self.pos.y > height - border_margin:
+            self.pos.y = height - border_margin
             self.velocity.y *= -bounce_factor
 
-    def _is_within_bounds(self, pos):
-        """Check if position is within valid bounds"""
-        border_margin = 20
-        return (border_margin <= pos.x <= WIDTH - border_margin and 
-                border_margin <= pos.y <= HEIGHT - border_margin)
-    
 
-def create_triangular_formation(center, radius, rl_agent):
+def create_triangular_formation(center, radius, rl_agent, rng=None, config=None, arena=None):
     """Creates 3 chasers in equilateral triangle formation"""
+    return create_ring_formation(center, radius, rl_agent, 3, rng, config, arena)
+
+
+def create_ring_formation(center, radius, rl_agent, count, rng=None, config=None, arena=None):
+    """Creates count chasers evenly spaced on a circle, the first at 30°"""
     chasers = []
-    for angle in [30, 150, 270]:  # 120° separation
+    for i in range(count):
+        angle = 30 + 360 * i / count
         chaser = ChaserIntelligent(
             center.x + radius * math.cos(math.radians(angle)),
             center.y + radius * math.sin(math.radians(angle)),
-            rl_agent
+            rl_agent,
+            rng,
+            config,
+            arena
         )
         chaser.formation_offset = pygame.Vector2(
             radius * math.cos(math.radians(angle)),
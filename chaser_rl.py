@@ -2,8 +2,9 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 import numpy as np
-from collections import deque
 import random
+import copy
+from replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
 
 class QNetwork(nn.Module):
     def __init__(self, state_dim, action_dim):
@@ -19,84 +20,180 @@ class QNetwork(nn.Module):
     def forward(self, x):
         return self.net(x)
 
+def _make_adam(params, lr):
+    """Fused CPU Adam when this torch has it (>= 2.4), otherwise the multi-tensor one"""
+    params = list(params)
+    try:
+        return optim.Adam(params, lr=lr, fused=True)
+    except (RuntimeError, TypeError):
+        return optim.Adam(params, lr=lr, foreach=True)
+
 class RLAgent:
-    def __init__(self, state_dim, action_dim):
+    def __init__(self, state_dim, action_dim, prioritized=False, seed=None, batch_size=64, grad_steps=1,
+                 tau=0.01, num_threads=None, bf16=False, lr=1e-3, gamma=0.99, epsilon=1.0, epsilon_min=0.1,
+                 epsilon_decay=0.995, buffer_size=10000):
+        """grad_steps gradient updates run per train() call. num_threads caps
+        torch's intra-op threads (process-wide). bf16=True runs the forward
+        passes under bfloat16 autocast. The keyword arguments match
+        utils.config.AgentConfig, so RLAgent(s, a, **asdict(config.agent))
+        builds the configured agent."""
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed)
+        if seed is not None:
+            torch.manual_seed(seed)
         self.q_net = QNetwork(state_dim, action_dim)
         self.target_net = QNetwork(state_dim, action_dim)
         self.target_net.load_state_dict(self.q_net.state_dict())
         
-        self.optimizer = optim.Adam(self.q_net.parameters(), lr=1e-3)
-        self.memory = deque(maxlen=10000)
-        self.batch_size = 64
-        self.gamma = 0.99
-        self.epsilon = 1.0
-        self.epsilon_min = 0.1
-        self.epsilon_decay = 0.995
+        self.optimizer = _make_adam(self.q_net.parameters(), lr=lr)
+        self.loss_fn = nn.MSELoss()
+        self._online_params = list(self.q_net.parameters())
+        self._target_params = list(self.target_net.parameters())
+        self.prioritized = prioritized
+        if prioritized:
+            self.memory = PrioritizedReplayBuffer(buffer_size, state_dim, seed=seed)
+        else:
+            self.memory = ReplayBuffer(buffer_size, state_dim, seed=seed)
+        self.batch_size = batch_size
+        self.grad_steps = grad_steps
+        self.tau = tau
+        self.bf16 = bf16
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.epsilon_min = epsilon_min
+        self.epsilon_decay = epsilon_decay
+        # Reused input tensor for select_actions, grown when a bigger batch arrives
+        self._obs_buffer = torch.empty((0, state_dim))
         
     def select_action(self, state, training=True):
-        if training and random.random() < self.epsilon:
-            return random.randint(0, self.q_net.net[-1].out_features - 1)
+        if training and self.rng.random() < self.epsilon:
+            return self.rng.randint(0, self.q_net.net[-1].out_features - 1)
         
         state_tensor = torch.FloatTensor(state)
         with torch.no_grad():
             q_values = self.q_net(state_tensor)
         return torch.argmax(q_values).item()
+
+    def select_actions(self, states, training=True):
+        """Epsilon-greedy actions for a batch of states (N, state_dim), in one no-grad forward pass.
+
+        Returns an int64 array of N actions. States are copied into a reused
+        input tensor and the exploring rows are drawn in one vectorized call.
+        """
+        states = np.asarray(states, dtype=np.float32)
+        n = len(states)
+        num_actions = self.q_net.net[-1].out_features
+        explore = (self.np_rng.random(n) < self.epsilon) if training else np.zeros(n, dtype=bool)
+        if explore.all():
+            return self.np_rng.integers(0, num_actions, n)
+
+        if n > len(self._obs_buffer):
+            self._obs_buffer = torch.empty((max(n, 2 * len(self._obs_buffer)), states.shape[1]))
+        batch = self._obs_buffer[:n]
+        batch.copy_(torch.from_numpy(states))
+        with torch.no_grad():
+            actions = self.q_net(batch).argmax(dim=1).numpy()
+        actions[explore] = self.np_rng.integers(0, num_actions, int(explore.sum()))
+        return actions
     
     def store_experience(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
-    
+        self.memory.add(state, action, reward, next_state, done)
+
+    def store_experiences(self, states, actions, rewards, next_states, dones):
+        """Store a batch of transitions given as stacked arrays"""
+        self.memory.add_batch(states, actions, rewards, next_states, dones)
+
     def train(self):
+        """Run grad_steps gradient updates, then decay epsilon once"""
         if len(self.memory) < self.batch_size:
             return
         
-        batch = random.sample(self.memory, self.batch_size)
-        states, actions, rewards, next_states, dones = zip(*batch)
+        for _ in range(self.grad_steps):
+            self._train_step()
         
-        # Convert to tensors
-        states = torch.FloatTensor(np.array(states))
-        actions = torch.LongTensor(actions)
-        rewards = torch.FloatTensor(rewards)
-        next_states = torch.FloatTensor(np.array(next_states))
-        dones = torch.FloatTensor(dones)
+        # Update exploration rate
+        self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
+
+    def _train_step(self):
+        idx = self.memory.sample_indices(self.batch_size)
+        states, actions, rewards, next_states, dones = self.memory.get(idx)
         
         # Ensure actions are within valid range
         actions = torch.clamp(actions, 0, self.q_net.net[-1].out_features - 1)
         
-        # Current Q values
-        current_q = self.q_net(states).gather(1, actions.unsqueeze(1))
-        
-        # Target Q values
-        with torch.no_grad():
-            next_q = self.target_net(next_states).max(1)[0]
-            target_q = rewards + (1 - dones) * self.gamma * next_q
+        with torch.autocast('cpu', dtype=torch.bfloat16, enabled=self.bf16):
+            # Current Q values
+            current_q = self.q_net(states).gather(1, actions.unsqueeze(1)).float()
+            
+            # Target Q values
+            with torch.no_grad():
+                next_q = self.target_net(next_states).max(1)[0].float()
+        target_q = rewards + (1 - dones) * self.gamma * next_q
         
-        # Compute loss
-        loss = nn.MSELoss()(current_q.squeeze(), target_q)
+        # Compute loss, weighted by importance sampling when replay is prioritized
+        if self.prioritized:
+            td_errors = target_q - current_q.squeeze()
+            weights = self.memory.importance_weights(idx)
+            loss = (weights * td_errors.pow(2)).mean()
+            self.memory.update_priorities(idx, td_errors.detach().numpy())
+        else:
+            loss = self.loss_fn(current_q.squeeze(), target_q)
         
         # Optimize
         self.optimizer.zero_grad()
         loss.backward()
         self.optimizer.step()
         
-        # Update exploration rate
-        self.epsilon = max(self.epsilon_min, self.epsilon * self.epsilon_decay)
-        
         # Soft update target network
         self._update_target_network()
     
     def _update_target_network(self):
-        for target_param, param in zip(self.target_net.parameters(), self.q_net.parameters()):
-            target_param.data.copy_(0.01 * param.data + 0.99 * target_param.data)
+        """target += tau * (online - target), one fused op over all parameters"""
+        with torch.no_grad():
+            torch._foreach_lerp_(self._target_params, self._online_params, self.tau)
     
+    def weights(self):
+        """Detached copy of the online network only, enough for evaluation or export"""
+        return {'q_net': copy.deepcopy(self.q_net.state_dict())}
+
+    def snapshot(self, include_memory=True):
+        """Detached copy of the training state, safe to write from another thread.
+
+        With include_memory the replay buffer is included, so training can
+        resume exactly where it stopped.
+        """
+        state = {
+            'q_net': copy.deepcopy(self.q_net.state_dict()),
+            'target_net': copy.deepcopy(self.target_net.state_dict()),
+            'optimizer': copy.deepcopy(self.optimizer.state_dict()),
+            'epsilon': self.epsilon,
+            'rng': self.rng.getstate(),
+            'np_rng': self.np_rng.bit_generator.state,
+            'torch_rng': torch.get_rng_state(),
+        }
+        if include_memory:
+            state['memory'] = self.memory.state_dict()
+        return state
+
+    def restore(self, state):
+        """Load a snapshot() or weights() dict; weights-only snapshots also reset the target network"""
+        self.q_net.load_state_dict(state['q_net'])
+        self.target_net.load_state_dict(state.get('target_net', state['q_net']))
+        if 'optimizer' in state:
+            self.optimizer.load_state_dict(state['optimizer'])
+        if 'epsilon' in state:
+            self.epsilon = state['epsilon']
+        if 'rng' in state:
+            self.rng.setstate(state['rng'])
+            self.np_rng.bit_generator.state = state['np_rng']
+            torch.set_rng_state(state['torch_rng'])
+        if 'memory' in state:
+            self.memory.load_state_dict(state['memory'])
+
     def save(self, path):
-        torch.save({
-            'q_net': self.q_net.state_dict(),
-            'target_net': self.target_net.state_dict(),
-            'optimizer': self.optimizer.state_dict()
-        }, path)
+        torch.save(self.snapshot(include_memory=False), path)
     
-    def load(self, path):
-        checkpoint = torch.load(path)
-        self.q_net.load_state_dict(checkpoint['q_net'])
-        self.target_net.load_state_dict(checkpoint['target_net'])
-        self.optimizer.load_state_dict(checkpoint['optimizer'])
\ No newline at end of file
+    def load(self, path, map_location='cpu'):
+        self.restore(torch.load(path, map_location=map_location, weights_only=True))
\ No newline at end of file
@@ -0,0 +1,152 @@
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+import torch
+
+WEIGHTS = 'weights'  # q_net only, for evaluation and export
+FULL = 'full'        # everything needed to resume training, replay buffer included
+_NAME = re.compile(r'^(weights|full)_ep(\d+)\.pth$')
+
+
+def atomic_save(obj, path):
+    """torch.save to a temporary file, then rename over path, so readers never see a partial file"""
+    tmp = path + '.tmp'
+    torch.save(obj, tmp)
+    os.replace(tmp, path)
+
+
+class CheckpointManager:
+    """Background checkpoint writer with keep-last-K and keep-best-by-metric retention.
+
+    save() copies the agent state on the calling thread and hands the
+    write to a single worker thread, so training only pays for the copy.
+    Files are written atomically. After each write, only the newest
+    keep_last snapshots of each kind and the keep_best weight snapshots
+    with the best metric are kept.
+
+    Retention ranks every snapshot in the directory's index, so a
+    directory belongs to one run. With fresh=True (a new, non-resuming
+    run) a directory that already holds snapshots is refused rather than
+    mixed with the new run's.
+    """
+    def __init__(self, directory, keep_last=3, keep_best=1, mode='max', fresh=False):
+        if mode not in ('max', 'min'):
+            raise ValueError(f"mode must be 'max' or 'min', not {mode!r}")
+        self.directory = directory
+        self.keep_last = keep_last
+        self.keep_best = keep_best
+        self.mode = mode
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, 'checkpoints.json')
+        self.index = {}
+        if fresh and (os.path.exists(self.index_path) or any(map(_NAME.match, os.listdir(directory)))):
+            raise FileExistsError(f"{directory} already holds checkpoints of another run; "
+                                  f"resume it or use another checkpoint directory")
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='checkpoint')
+        self._pending = []
+
+    def path(self, kind, episode):
+        return os.path.join(self.directory, f'{kind}_ep{episode:05d}.pth')
+
+    def save(self, agent, episode, metric=None, full=False, **extra):
+        """Queue a weights-only snapshot, or a full resumable one when full=True.
+
+        metric ranks weights snapshots for keep-best retention. extra keys
+        (seed, ...) are stored in the snapshot. Returns the target path.
+        """
+        kind = FULL if full else WEIGHTS
+        metric = None if metric is None else float(metric)
+        state = agent.snapshot(include_memory=True) if full else agent.weights()
+        state.update(episode=episode, metric=metric, **extra)
+        path = self.path(kind, episode)
+        self._raise_failed()
+        self._pending.append(self._executor.submit(self._write, state, path, kind, episode, metric))
+        return path
+
+    def _write(self, state, path, kind, episode, metric):
+        atomic_save(state, path)
+        self.index[os.path.basename(path)] = {'kind': kind, 'episode': episode, 'metric': metric}
+        self._prune()
+        tmp = self.index_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    def _prune(self):
+        keep = set()
+        for kind in (WEIGHTS, FULL):
+            names = sorted((n for n, e in self.index.items() if e['kind'] == kind),
+                           key=lambda n: self.index[n]['episode'])
+            keep.update(names[-self.keep_last:] if self.keep_last > 0 else [])
+        keep.update(self.best(self.keep_best))
+        for name in list(self.index):
+            if name not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+                del self.index[name]
+
+    def best(self, k=1):
+        """File names of the k weight snapshots with the best metric"""
+        ranked = [(e['metric'], n) for n, e in self.index.items()
+                  if e['kind'] == WEIGHTS and e['metric'] is not None]
+        ranked.sort(reverse=self.mode == 'max')
+        return [n for _, n in ranked[:k]]
+
+    def latest(self, kind=FULL):
+        """Path of the newest snapshot of a kind on disk, or None"""
+        found = [(int(m.group(2)), name) for name in os.listdir(self.directory)
+                 if (m := _NAME.match(name)) and m.group(1) == kind]
+        return os.path.join(self.directory, max(found)[1]) if found else None
+
+    def _raise_failed(self):
+        done = [f for f in self._pending if f.done()]
+        self._pending = [f for f in self._pending if not f.done()]
+        for f in done:
+            f.result()
+
+    def wait(self):
+        """Block until every queued write is on disk (re-raising write errors)"""
+        for f in self._pending:
+            f.result()
+        self._pending = []
+
+    def close(self):
+        self.wait()
+        self._executor.shutdown()
+
+
+def new_run_dir(root):
+    """Create and return an empty root/run_<start time> directory for a new run"""
+    base = os.path.join(root, time.strftime("run_%Y%m%d-%H%M%S"))
+    path, n = base, 0
+    while True:
+        try:
+            os.makedirs(path)
+            return path
+        except FileExistsError:  # another run started in the same second
+            n += 1
+            path = f"{base}-{n}"
+
+
+def latest_run_dir(root):
+    """Newest root/run_* directory holding a full snapshot, or None"""
+    if not os.path.isdir(root):
+        return None
+    runs = sorted((name for name in os.listdir(root) if name.startswith("run_")), reverse=True)
+    for name in runs:
+        path = os.path.join(root, name)
+        if os.path.isdir(path) and any((m := _NAME.match(f)) and m.group(1) == FULL for f in os.listdir(path)):
+            return path
+    return None
+
+
+def load_snapshot(path, map_location='cpu'):
+    """Read a checkpoint written by CheckpointManager or RLAgent.save"""
+    return torch.load(path, map_location=map_location, weights_only=True)
@@ -1,20 +1,31 @@
 import numpy as np
-from collections import defaultdict
-import pygame
+from exploration_grid import ExplorationGrid
+from spatial_index import SpatialHash
+from utils.config import RewardConfig
+
+# Offsets of the 4 exploration probes (0, 90, 180, 270 degrees, 100px away)
+PROBE_ANGLES = np.radians([0, 90, 180, 270])
+PROBE_OFFSETS = np.column_stack([np.cos(PROBE_ANGLES) * 100, np.sin(PROBE_ANGLES) * 100])
 
 class DroneEnv:
-    def __init__(self, width, height, sense_radius):
+    def __init__(self, width, height, sense_radius, cell_size=30, rewards=None, frontier_margin=20):
         self.width = width
         self.height = height
         self.sense_radius = sense_radius
-        self.cell_size = 30  # Reduced from 40 for smoother movement
-        self.exploration_map = defaultdict(int)
+        self.cell_size = cell_size  # Reduced from 40 for smoother movement
+        self.rewards = rewards or RewardConfig()
+        self.exploration_map = ExplorationGrid(width, height, self.cell_size, frontier_margin)
         
     def reset(self):
         self.exploration_map.clear()
         
-    def get_state(self, chaser, runner, other_chasers):
-        """Convert environment observations to state vector"""
+    def get_state(self, chaser, runner, other_chasers, index=None):
+        """Convert environment observations to state vector.
+
+        index is an optional SpatialHash over all chasers, used instead of
+        scanning other_chasers (which may include chaser itself) for the
+        nearest neighbour.
+        """
         state = []
         
         # 1. Relative runner position (normalized)
@@ -25,17 +36,11 @@ class DroneEnv:
             state.extend([0, 0, 0])  # 0.0 = not visible
             
         # 2. Local exploration (4 directions)
-        for angle in [0, 90, 180, 270]:
-            sample_pos = chaser.pos + pygame.Vector2(
-                np.cos(np.radians(angle)) * 100,
-                np.sin(np.radians(angle)) * 100
-            )
-            visits = self.get_visit_count(sample_pos)
-            state.append(min(visits, 10) / 10)  # Normalized 0-1
-
+        visits = self.get_visit_count(PROBE_OFFSETS + (chaser.pos.x, chaser.pos.y))
+        state.extend(np.minimum(visits, 10) / 10)  # Normalized 0-1
             
         # 3. Nearest neighbor info
-        nearest = self._get_nearest_chaser(chaser, other_chasers)
+        nearest = self._get_nearest_chaser(chaser, other_chasers, index)
         if nearest:
             rel_pos = (nearest.pos - chaser.pos) / self.sense_radius
             state.extend([rel_pos.x, rel_pos.y])
@@ -43,13 +48,48 @@ class DroneEnv:
             state.extend([0, 0])
             
         return np.array(state, dtype=np.float32)
+
+    def get_states(self, chasers, runner, index=None):
+        """Observations of all chasers as an (N, 9) float32 matrix.
+
+        Runner and probe columns are computed in one vectorized pass; the
+        nearest-neighbour columns come from index (a SpatialHash over the
+        chasers, built here when None), so the cost stays O(N) for bounded
+        local density.
+        """
+        pos = np.array([(c.pos.x, c.pos.y) for c in chasers], dtype=np.float64).reshape(-1, 2)
+        n = len(pos)
+        states = np.zeros((n, 9), dtype=np.float32)
+
+        # 1. Relative runner position (normalized) and visibility flag
+        to_runner = np.array((runner.pos.x, runner.pos.y)) - pos
+        visible = np.hypot(to_runner[:, 0], to_runner[:, 1]) <= self.sense_radius
+        states[visible, 0:2] = to_runner[visible] / self.sense_radius
+        states[visible, 2] = 1.0
+
+        # 2. Local exploration probes
+        probes = (pos[:, None, :] + PROBE_OFFSETS[None, :, :]).reshape(-1, 2)
+        visits = self.get_visit_count(probes).reshape(n, 4)
+        states[:, 3:7] = np.minimum(visits, 10) / 10
+
+        # 3. Nearest visible neighbour
+        if n > 1:
+            if index is None:
+                index = SpatialHash(self.sense_radius).build(chasers)
+            for i, chaser in enumerate(chasers):
+                nearest = index.nearest(chaser.pos, self.sense_radius, exclude=chaser)
+                if nearest is not None:
+                    rel = (nearest.pos - chaser.pos) / self.sense_radius
+                    states[i, 7:9] = (rel.x, rel.y)
+
+        return states
     
     def get_reward(self, chaser, runner, other_chasers):
         reward = 0
         
         # Enhanced exploration rewards
         visits = self.get_visit_count(chaser.pos)
-        reward -= visits * 0.1
+        reward -= visits * self.rewards.visit_penalty
         
         # if hasattr(chaser, 'explore_target') and chaser.explore_target:
         #     target_visits = self.get_visit_count(chaser.explore_target)
@@ -57,21 +97,23 @@ class DroneEnv:
         #         reward += 0.5 * (1 - chaser.pos.distance_to(chaser.explore_target)/500)
         
         # Small constant penalty to encourage movement
-        reward -= 0.01
+        reward -= self.rewards.step_penalty
         
         return reward
     
     def get_visit_count(self, pos):
-        cell = (int(pos.x / self.cell_size), int(pos.y / self.cell_size))
-        return self.exploration_map[cell]
+        """Visits of the cell under pos; also accepts an (N, 2) array of positions"""
+        return self.exploration_map.get_visit_count(pos)
     
     def mark_visited(self, pos):
-        cell = (int(pos.x / self.cell_size), int(pos.y / self.cell_size))
-        self.exploration_map[cell] += 1
+        """Count a visit to the cell under pos; also accepts an (N, 2) array of positions"""
+        self.exploration_map.mark_visited(pos)
         
     def _can_see(self, pos1, pos2):
         return pos1.distance_to(pos2) <= self.sense_radius
         
-    def _get_nearest_chaser(self, current, others):
-        visible = [c for c in others if self._can_see(current.pos, c.pos)]
+    def _get_nearest_chaser(self, current, others, index=None):
+        if index is not None:
+            return index.nearest(current.pos, self.sense_radius, exclude=current)
+        visible = [c for c in others if c is not current and self._can_see(current.pos, c.pos)]
         return min(visible, key=lambda c: current.pos.distance_to(c.pos)) if visible else None
\ No newline at end of file
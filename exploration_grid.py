@@ -0,0 +1,189 @@
+import math
+import random
+import numpy as np
+
+
+class ExplorationGrid:
+    """Dense per-cell visit counts over the arena.
+
+    Positions may be a single point (pygame.Vector2 or (x, y)) or an (N, 2)
+    array. Points outside the arena count as never visited and are ignored
+    by mark_visited.
+
+    The grid also tracks the exploration frontier: cells visited at most
+    FRONTIER_MAX_VISITS times whose centre lies frontier_margin inside the
+    border. Frontier cells are bucketed into blocks of BLOCK x BLOCK cells with
+    a per-block count, so radius queries only look at non-empty nearby blocks.
+    """
+    FRONTIER_MAX_VISITS = 1
+    BLOCK = 8
+
+    def __init__(self, width, height, cell_size, frontier_margin=20):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cols = math.ceil(width / cell_size)
+        self.rows = math.ceil(height / cell_size)
+        self.visits = np.zeros((self.cols, self.rows), dtype=np.int32)
+        self.explored_cells = 0  # cells with at least one visit
+
+        centers_x = (np.arange(self.cols) + 0.5) * cell_size
+        centers_y = (np.arange(self.rows) + 0.5) * cell_size
+        self.eligible = np.outer((centers_x >= frontier_margin) & (centers_x <= width - frontier_margin),
+                                 (centers_y >= frontier_margin) & (centers_y <= height - frontier_margin))
+        self.block_cols = math.ceil(self.cols / self.BLOCK)
+        self.block_rows = math.ceil(self.rows / self.BLOCK)
+        self._reset_frontier()
+
+    def _reset_frontier(self):
+        self.frontier = self.eligible.copy()
+        padded = np.zeros((self.block_cols * self.BLOCK, self.block_rows * self.BLOCK), dtype=np.int32)
+        padded[:self.cols, :self.rows] = self.frontier
+        self.block_counts = padded.reshape(self.block_cols, self.BLOCK, self.block_rows, self.BLOCK).sum(axis=(1, 3))
+
+    @property
+    def num_cells(self):
+        return self.cols * self.rows
+
+    def coverage(self):
+        """Fraction of cells visited at least once"""
+        return self.explored_cells / self.num_cells
+
+    def clear(self):
+        self.visits.fill(0)
+        self.explored_cells = 0
+        self._reset_frontier()
+
+    def cell_of(self, pos):
+        """(col, row) of a single position, or None when outside the arena"""
+        cx, cy = int(pos[0] // self.cell_size), int(pos[1] // self.cell_size)
+        if 0 <= cx < self.cols and 0 <= cy < self.rows:
+            return cx, cy
+        return None
+
+    def _flat_cells(self, positions):
+        """Flat cell indices of an (N, 2) array and a mask of those inside the arena"""
+        cells = np.floor_divide(positions, self.cell_size).astype(np.int64)
+        inside = ((cells[:, 0] >= 0) & (cells[:, 0] < self.cols) &
+                  (cells[:, 1] >= 0) & (cells[:, 1] < self.rows))
+        return cells[:, 0] * self.rows + cells[:, 1], inside
+
+    def flat_cells(self, positions):
+        """Flat cell index (col * rows + row) per position, -1 outside the arena"""
+        flat, inside = self._flat_cells(np.asarray(positions, dtype=np.float64).reshape(-1, 2))
+        return np.where(inside, flat, -1)
+
+    def get_visit_count(self, pos):
+        if _is_point(pos):
+            cell = self.cell_of(pos)
+            return int(self.visits[cell]) if cell else 0
+        flat, inside = self._flat_cells(np.asarray(pos, dtype=np.float64).reshape(-1, 2))
+        counts = np.zeros(len(flat), dtype=np.int32)
+        counts[inside] = self.visits.ravel()[flat[inside]]
+        return counts
+
+    def mark_visited(self, pos):
+        if _is_point(pos):
+            cell = self.cell_of(pos)
+            if cell:
+                if self.visits[cell] == 0:
+                    self.explored_cells += 1
+                self.visits[cell] += 1
+                if self.visits[cell] == self.FRONTIER_MAX_VISITS + 1 and self.frontier[cell]:
+                    self.frontier[cell] = False
+                    self.block_counts[cell[0] // self.BLOCK, cell[1] // self.BLOCK] -= 1
+            return
+        flat, inside = self._flat_cells(np.asarray(pos, dtype=np.float64).reshape(-1, 2))
+        cells, counts = np.unique(flat[inside], return_counts=True)
+        flat_visits = self.visits.ravel()
+        self.explored_cells += int(np.count_nonzero(flat_visits[cells] == 0))
+        flat_visits[cells] += counts.astype(np.int32)
+
+        flat_frontier = self.frontier.ravel()
+        leaving = cells[flat_frontier[cells] & (flat_visits[cells] > self.FRONTIER_MAX_VISITS)]
+        if len(leaving):
+            flat_frontier[leaving] = False
+            np.subtract.at(self.block_counts,
+                           ((leaving // self.rows) // self.BLOCK, (leaving % self.rows) // self.BLOCK), 1)
+
+    def _frontier_cells(self, block_x0, block_x1, block_y0, block_y1):
+        """Centres (N, 2) of frontier cells inside the given inclusive block range"""
+        bx, by = np.nonzero(self.block_counts[block_x0:block_x1 + 1, block_y0:block_y1 + 1])
+        centers = []
+        for i, j in zip(bx + block_x0, by + block_y0):
+            x0, y0 = i * self.BLOCK, j * self.BLOCK
+            cx, cy = np.nonzero(self.frontier[x0:x0 + self.BLOCK, y0:y0 + self.BLOCK])
+            centers.append(np.column_stack([cx + x0, cy + y0]))
+        if not centers:
+            return np.empty((0, 2))
+        return (np.concatenate(centers) + 0.5) * self.cell_size
+
+    def _block_range(self, pos, radius):
+        span = self.BLOCK * self.cell_size
+        return (max(0, int((pos[0] - radius) // span)), min(self.block_cols - 1, int((pos[0] + radius) // span)),
+                max(0, int((pos[1] - radius) // span)), min(self.block_rows - 1, int((pos[1] + radius) // span)))
+
+    def frontier_within(self, pos, radius, min_radius=0):
+        """Centres of frontier cells whose distance to pos is in [min_radius, radius]"""
+        centers = self._frontier_cells(*self._block_range(pos, radius))
+        dist_sq = ((centers - (pos[0], pos[1])) ** 2).sum(axis=1)
+        return centers[(dist_sq <= radius * radius) & (dist_sq >= min_radius * min_radius)]
+
+    def random_frontier(self, pos, radius, min_radius=0, rng=None):
+        """A uniformly chosen frontier cell centre within radius, or None"""
+        centers = self.frontier_within(pos, radius, min_radius)
+        if not len(centers):
+            return None
+        i = rng.randrange(len(centers)) if rng else random.randrange(len(centers))
+        return float(centers[i, 0]), float(centers[i, 1])
+
+    def nearest_frontier(self, pos, radius=None):
+        """Closest frontier cell centre (optionally within radius), or None.
+
+        Searches rings of blocks outward from pos and stops once a ring is
+        farther away than the best cell found so far.
+        """
+        if not self.block_counts.any():
+            return None
+        span = self.BLOCK * self.cell_size
+        bx = min(max(int(pos[0] // span), 0), self.block_cols - 1)
+        by = min(max(int(pos[1] // span), 0), self.block_rows - 1)
+        limit = math.inf if radius is None else radius
+        best, best_dist = None, math.inf
+        for ring in range(max(self.block_cols, self.block_rows) + 1):
+            # Every block in this ring is at least (ring - 1) * span away
+            if (ring - 1) * span > min(limit, math.sqrt(best_dist)):
+                break
+            for x0, x1, y0, y1 in self._ring_ranges(bx, by, ring):
+                centers = self._frontier_cells(x0, x1, y0, y1)
+                if not len(centers):
+                    continue
+                dist_sq = ((centers - (pos[0], pos[1])) ** 2).sum(axis=1)
+                i = int(np.argmin(dist_sq))
+                if dist_sq[i] < best_dist:
+                    best, best_dist = (float(centers[i, 0]), float(centers[i, 1])), dist_sq[i]
+        if best is None or best_dist > limit * limit:
+            return None
+        return best
+
+    def _ring_ranges(self, bx, by, ring):
+        """Inclusive block ranges covering the square ring at Chebyshev distance ring"""
+        x0, x1 = max(bx - ring, 0), min(bx + ring, self.block_cols - 1)
+        if ring == 0:
+            return [(bx, bx, by, by)]
+        ranges = []
+        if by - ring >= 0:
+            ranges.append((x0, x1, by - ring, by - ring))
+        if by + ring < self.block_rows:
+            ranges.append((x0, x1, by + ring, by + ring))
+        inner_y0, inner_y1 = max(by - ring + 1, 0), min(by + ring - 1, self.block_rows - 1)
+        if inner_y0 <= inner_y1:
+            if bx - ring >= 0:
+                ranges.append((bx - ring, bx - ring, inner_y0, inner_y1))
+            if bx + ring < self.block_cols:
+                ranges.append((bx + ring, bx + ring, inner_y0, inner_y1))
+        return ranges
+
+
+def _is_point(pos):
+    return hasattr(pos, "x") or np.ndim(pos) == 1
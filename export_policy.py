@@ -0,0 +1,113 @@
+import argparse
+import os
+import numpy as np
+import torch
+from chaser_rl import QNetwork
+from numpy_policy import NumpyQNetwork
+
+FORMATS = ('torchscript', 'onnx', 'numpy')
+
+
+def load_q_network(path):
+    """QNetwork with the online weights of an RLAgent checkpoint, in eval mode on the CPU"""
+    checkpoint = torch.load(path, map_location='cpu')
+    state_dict = checkpoint.get('q_net', checkpoint)
+    state_dim = state_dict['net.0.weight'].shape[1]
+    action_dim = state_dict['net.4.weight'].shape[0]
+    net = QNetwork(state_dim, action_dim)
+    net.load_state_dict(state_dict)
+    return net.eval()
+
+
+def export_torchscript(net, path):
+    """Frozen TorchScript module: weights inlined as constants, no optimizer state"""
+    frozen = torch.jit.freeze(torch.jit.script(net))
+    frozen.save(path)
+    return path
+
+
+def export_onnx(net, path):
+    """ONNX graph with a dynamic batch dimension (needs the onnx package)"""
+    dummy = torch.zeros(1, net.net[0].in_features)
+    torch.onnx.export(net, dummy, path, input_names=['states'], output_names=['q_values'],
+                      dynamic_axes={'states': {0: 'batch'}, 'q_values': {0: 'batch'}})
+    return path
+
+
+def export_numpy(net, path):
+    """float32 weights and biases as .npz, for NumpyQNetwork"""
+    np.savez(path, **{k: v.numpy() for k, v in net.state_dict().items()})
+    return path
+
+
+def check_agreement(net, paths, num_states=4096, atol=1e-5, seed=0):
+    """Compare every exported artifact with the torch model on random states.
+
+    Returns {format: (max abs Q difference, fraction of equal greedy actions)}
+    and raises AssertionError when an artifact is off by more than atol.
+    """
+    states = np.random.default_rng(seed).standard_normal((num_states, net.net[0].in_features)).astype(np.float32)
+    with torch.no_grad():
+        expected = net(torch.from_numpy(states)).numpy()
+
+    outputs = {}
+    if 'torchscript' in paths:
+        scripted = torch.jit.load(paths['torchscript'])
+        with torch.no_grad():
+            outputs['torchscript'] = scripted(torch.from_numpy(states)).numpy()
+    if 'onnx' in paths:
+        try:
+            import onnxruntime
+        except ImportError:
+            print("onnxruntime not installed, skipping the ONNX agreement check")
+        else:
+            session = onnxruntime.InferenceSession(paths['onnx'])
+            outputs['onnx'] = session.run(None, {'states': states})[0]
+    if 'numpy' in paths:
+        outputs['numpy'] = NumpyQNetwork.load(paths['numpy'])(states)
+
+    report = {}
+    for fmt, q in outputs.items():
+        max_diff = float(np.abs(q - expected).max())
+        same_action = float((q.argmax(axis=1) == expected.argmax(axis=1)).mean())
+        report[fmt] = (max_diff, same_action)
+        print(f"{fmt:<12} max |dQ| = {max_diff:.3g}, greedy actions equal: {same_action:.2%}")
+        if max_diff > atol:
+            raise AssertionError(f"{fmt} export differs from the torch model by {max_diff:.3g} (atol {atol})")
+    return report
+
+
+def export(checkpoint, out_dir=None, formats=FORMATS, atol=1e-5):
+    """Export the checkpoint's Q-network next to it (or into out_dir) and check each artifact"""
+    net = load_q_network(checkpoint)
+    stem = os.path.splitext(os.path.basename(checkpoint))[0]
+    out_dir = out_dir or os.path.dirname(checkpoint) or '.'
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, stem)
+
+    paths = {}
+    if 'torchscript' in formats:
+        paths['torchscript'] = export_torchscript(net, base + '.ts.pt')
+    if 'onnx' in formats:
+        try:
+            paths['onnx'] = export_onnx(net, base + '.onnx')
+        except ImportError as e:
+            print(f"Skipping ONNX export: {e}")
+    if 'numpy' in formats:
+        paths['numpy'] = export_numpy(net, base + '.npz')
+    for fmt, path in paths.items():
+        print(f"Saved {fmt} policy to {path}")
+    check_agreement(net, paths, atol=atol)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export RLAgent checkpoints to frozen inference artifacts")
+    parser.add_argument("checkpoints", nargs="+", help="model/*.pth files saved by RLAgent.save")
+    parser.add_argument("--out-dir", default=None, help="defaults to each checkpoint's directory")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--atol", type=float, default=1e-5,
+                        help="largest Q-value difference accepted from an exported artifact")
+    args = parser.parse_args()
+    for checkpoint in args.checkpoints:
+        export(checkpoint, args.out_dir, args.formats, args.atol)
@@ -1,34 +1,116 @@
+import argparse
+import glob
 import json
 import os
-import matplotlib.pyplot as plt
-
-total_reward = []
-steps = []
-explored = []
-average_q_val = []
-
-# Load JSON from file
-for filename in os.listdir("./logs"):
-    if filename.endswith('.json'):
-        file_path = os.path.join("./logs", filename)
-        
-        # Open and load the JSON file
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-
-        # Extract episode data
-        episodes = data["episode_data"]
-
-        # Iterate over each episode and print summary
-        for episode_id, stats in episodes.items():
-            # print(f"Episode {episode_id}:")
-            # print(f"  Total Reward: {stats['total_reward']}")
-            # print(f"  Steps: {stats['steps']}")
-            # print(f"  Capture Success: {stats['capture_success']}")
-            # print(f"  Explored Percentage: {stats['explored_percentage']:.2%}")
-            # print(f"  Avg Q-Value: {stats['avg_q_value']:.4f}")
-            # print()
-            total_reward.append(stats['total_reward'])
-            steps.append(stats['steps'])
-            explored.append(stats['explored_percentage'])
-            average_q_val.append(stats['explored_percentage'])
+import re
+import numpy as np
+from metrics_logger import read_jsonl, columns_from_records
+
+DEFAULT_METRICS = ['total_reward', 'steps', 'capture_success', 'explored_percentage']
+
+
+def load_stream(path):
+    """Columns of one metrics stream: the compacted .npz next to it if present, else the .jsonl"""
+    npz_path = os.path.splitext(path)[0] + '.npz'
+    if os.path.exists(npz_path) and os.path.getmtime(npz_path) >= os.path.getmtime(path):
+        with np.load(npz_path) as data:
+            return {k: data[k] for k in data.files}
+    return columns_from_records({r['episode']: r for r in read_jsonl(path)})
+
+
+def load_legacy(paths):
+    """Columns from old full-history metrics_ep*.json checkpoints.
+
+    Each checkpoint contains every episode before it, so only the newest one
+    is parsed; episodes are keyed by id, so nothing is double-counted.
+    """
+    def ep_number(p):
+        m = re.search(r'ep(\d+)', os.path.basename(p))
+        return int(m.group(1)) if m else -1
+    newest = max(paths, key=ep_number)
+    with open(newest) as f:
+        data = json.load(f)
+    return columns_from_records({int(k): v for k, v in data['episode_data'].items()})
+
+
+def load_runs(paths):
+    """{run label: columns} for every metrics stream / legacy checkpoint set under the given paths"""
+    runs = {}
+    for path in paths:
+        if os.path.isdir(path):
+            streams = sorted(glob.glob(os.path.join(path, '*.jsonl')))
+            legacy = sorted(glob.glob(os.path.join(path, 'metrics_ep*.json')))
+        elif path.endswith('.jsonl'):
+            streams, legacy = [path], []
+        else:
+            streams, legacy = [], [path]
+        for stream in streams:
+            runs[os.path.relpath(stream)] = load_stream(stream)
+        if legacy:
+            runs[os.path.relpath(path) + ' (legacy)'] = load_legacy(legacy)
+    return runs
+
+
+def moving_average(values, window):
+    """Trailing mean over up to `window` points, computed with one cumulative sum"""
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return values
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    idx = np.arange(1, len(values) + 1)
+    start = np.maximum(idx - window, 0)
+    return (csum[idx] - csum[start]) / (idx - start)
+
+
+def summarize(runs, window):
+    """Print a last-window summary per run"""
+    header = f"{'run':<50} {'episodes':>8} {'capture':>8} {'steps':>8} {'reward':>10} {'explored':>9}"
+    print(header)
+    print('-' * len(header))
+    for label, cols in runs.items():
+        tail = slice(-window, None)
+        def mean(k):
+            return np.nanmean(cols[k][tail]) if k in cols and len(cols[k]) else np.nan
+        print(f"{label[-50:]:<50} {len(cols['episode']):>8} {mean('capture_success'):>8.2%} "
+              f"{mean('steps'):>8.1f} {mean('total_reward'):>10.2f} {mean('explored_percentage'):>9.2%}")
+
+
+def plot(runs, metrics, window, out_path):
+    """Render moving averages of each metric (one panel per metric, one line per run) to PNG"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(len(metrics), 1, figsize=(10, 3 * len(metrics)), sharex=True, squeeze=False)
+    for ax, metric in zip(axes[:, 0], metrics):
+        for label, cols in runs.items():
+            if metric in cols:
+                ax.plot(cols['episode'], moving_average(cols[metric], window), label=label, linewidth=1)
+        ax.set_ylabel(metric)
+        ax.grid(alpha=0.3)
+    axes[-1, 0].set_xlabel('episode')
+    axes[0, 0].legend(fontsize='small')
+    axes[0, 0].set_title(f'Moving average (window={window})')
+    fig.tight_layout()
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    fig.savefig(out_path, dpi=120)
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate and plot training metrics from one or more runs")
+    parser.add_argument("paths", nargs="*", default=["./logs"],
+                        help="log directories, .jsonl streams or legacy metrics_ep*.json files")
+    parser.add_argument("--window", type=int, default=50)
+    parser.add_argument("--metrics", nargs="+", default=DEFAULT_METRICS)
+    parser.add_argument("--out", default="plots/metrics.png")
+    parser.add_argument("--no-plot", action="store_true")
+    args = parser.parse_args()
+
+    runs = load_runs(args.paths)
+    if not runs:
+        raise SystemExit(f"No metrics found in {args.paths}")
+    summarize(runs, args.window)
+    if not args.no_plot:
+        plot(runs, args.metrics, args.window, args.out)
+        print(f"Saved {args.out}")
@@ -1,15 +1,23 @@
+import argparse
 import pygame
 import math
+import numpy as np
 from runner import Runner
 from chaser import Chaser, create_triangular_formation, draw_chaser_lines
-from utils.colors import WHITE, GRAY, GREEN
-from utils.params import WIDTH, HEIGHT, SENSE_RADIUS
+from utils.params import WIDTH, HEIGHT, SENSE_RADIUS, CHASER_SPACING
+from spatial_index import SpatialHash
+from renderer import Renderer
+from swarm_core import SwarmState, step_hybrid_chasers
 import random
 
-# Initialize Pygame
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Smooth Drone Movement")
+parser = argparse.ArgumentParser(description="Scripted chaser swarm demo")
+parser.add_argument("--vectorized", action="store_true",
+                    help="step the chasers with the batched swarm_core kernels instead of per-chaser updates")
+args = parser.parse_args()
+
+# Initialize Pygame (background and grid are drawn once by the renderer)
+renderer = Renderer(WIDTH, HEIGHT, "Smooth Drone Movement", grid_spacing=100, fps=60)
+screen = renderer.screen
 
 def is_far_from_chasers(candidate, chasers, radius):
     return all(candidate.distance_to(ch.pos) >= radius for ch in chasers)
@@ -25,36 +33,37 @@ while True:
 runner = Runner(rand_pos.x, rand_pos.y)
 
 # Main loop
-clock = pygame.time.Clock()
+index = SpatialHash(CHASER_SPACING)
+# Struct-of-arrays copy of the chasers, written back to them every tick for drawing
+swarm = SwarmState.from_entities(chasers) if args.vectorized else None
+swarm_rng = np.random.default_rng()
 running = True
 
 while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+    if renderer.poll_quit():
+        running = False
     
     # Update
     runner.update_random()
     # runner.update_with_avoidance(chasers)
     runner_pos = runner.get_position()
-    for chaser in chasers:
-        dist = chaser.pos.distance_to(runner_pos)
-        # chaser.update_simple(runner_pos, dist <= SENSE_RADIUS, chasers)
-        chaser.update_hybrid_1(runner_pos, dist <= SENSE_RADIUS, chasers)
-    
-    # Draw
-    screen.fill(WHITE)
+    if swarm is not None:
+        step_hybrid_chasers(swarm, (runner_pos.x, runner_pos.y), swarm_rng)
+        swarm.to_entities(chasers)
+    else:
+        index.build(chasers)
+        for chaser in chasers:
+            dist = chaser.pos.distance_to(runner_pos)
+            # chaser.update_simple(runner_pos, dist <= SENSE_RADIUS, chasers, index)
+            chaser.update_hybrid_1(runner_pos, dist <= SENSE_RADIUS, chasers, index)
     
-    # Draw grid
-    for x in range(0, WIDTH, 100):
-        pygame.draw.line(screen, GRAY, (x, 0), (x, HEIGHT), 1)
-    for y in range(0, HEIGHT, 100):
-        pygame.draw.line(screen, GRAY, (0, y), (WIDTH, y), 1)    
+    # Draw (only the areas around moving drones are redrawn)
+    renderer.begin_frame()
     
     captured = False
     # Draw drones
     for chaser in chasers:
-        chaser.draw(screen)
+        renderer.add(chaser.draw(screen))
         if (chaser.has_captured(runner.get_position())):
             print("RUNNER CAPTURED")
             captured = True
@@ -63,11 +72,11 @@ while running:
     if (captured):
         break     
 
-    runner.draw(screen)
+    renderer.add(runner.draw(screen))
     
-    draw_chaser_lines(screen, chasers)
+    renderer.add(draw_chaser_lines(screen, chasers))
 
-    pygame.display.flip()
-    clock.tick(60)
+    renderer.end_frame()
+    renderer.tick()
 
-pygame.quit()
\ No newline at end of file
+renderer.close()
\ No newline at end of file
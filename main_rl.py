@@ -2,46 +2,222 @@ import pygame
 import numpy as np
 from drone_env import DroneEnv
 from runner import Runner
-from chaser_intelligent import create_triangular_formation
+from chaser_intelligent import create_ring_formation
 from chaser_rl import RLAgent
 import random
-from metrics_logger import MetricsLogger
+import argparse
+import os
+import time
+import cProfile
+from metrics_logger import MetricsLogger, compact
+from step_recorder import StepRecorder, load_trace
+from phase_timer import PhaseTimer
+from checkpoint import CheckpointManager, load_snapshot, new_run_dir, latest_run_dir
+from renderer import Renderer
+from spatial_index import SpatialHash
+from utils.params import CHASER_SPACING
+from utils.config import Config, add_config_args, load_config, apply_overrides, from_dict, to_dict, save_config
+from dataclasses import asdict
 # import torch
 
-# Constants
-WIDTH, HEIGHT = 1920, 1080
-SENSE_RADIUS = 400
-NUM_EPISODES = 1000
-MAX_STEPS = 1000
+RUNS_ROOT = "model"  # new runs without --checkpoint-dir get a run_<start time> directory here
 
 def is_far_from_chasers(candidate, chasers, radius):
     return all(candidate.distance_to(ch.pos) >= radius for ch in chasers)
 
-def initialize_simulation(rl_agent):
-    """Initialize Pygame and create new entities"""
-    pygame.init()
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Drone Pursuit RL")
-    clock = pygame.time.Clock()
-    
-    env = DroneEnv(WIDTH, HEIGHT, SENSE_RADIUS)
+def initialize_simulation(rl_agent, seed=None, config=None, num_chasers=3):
+    """Create a new environment and entities for one episode.
+
+    num_chasers chasers start on a ring around the arena centre (three
+    form the original triangle). All randomness of the episode (spawn point and every entity's
+    behaviour) comes from one random.Random(seed), so a seed and a
+    config (defaults when None) fully determine the episode.
+    """
+    config = config or Config()
+    arena = config.arena
+    rng = random.Random(seed)
+    env = DroneEnv(arena.width, arena.height, arena.sense_radius, arena.cell_size, config.reward, arena.frontier_margin)
     
-    chasers = create_triangular_formation(pygame.Vector2(WIDTH//2, HEIGHT//2), 500, rl_agent)
+    chasers = create_ring_formation(pygame.Vector2(arena.width//2, arena.height//2), config.chaser.formation_radius,
+                                    rl_agent, num_chasers, rng, config.chaser, arena)
 
     while True:
-        rand_pos = pygame.Vector2(random.randint(50, WIDTH-50), random.randint(50, HEIGHT-50))
-        if is_far_from_chasers(rand_pos, chasers, SENSE_RADIUS):
+        rand_pos = pygame.Vector2(rng.randint(50, arena.width-50), rng.randint(50, arena.height-50))
+        if is_far_from_chasers(rand_pos, chasers, arena.sense_radius):
             break
 
-    runner = Runner(rand_pos.x, rand_pos.y)
+    runner = Runner(rand_pos.x, rand_pos.y, rng, config.runner, arena)
+
+    return env, runner, chasers
+
+def simulate_step(env, runner, chasers):
+    """Advance the pursuit by one tick.
+
+    The runner moves first, then each chaser in turn observes (the moved
+    runner, the chasers updated before it and their visits) and acts,
+    marking its cell visited. Neighbour lookups use one SpatialHash over
+    the chasers built per tick, with slack for the farthest any of them
+    can move before it is queried. A running count of chasers whose last
+    observation shows the runner tells each chaser whether the rest of
+    the swarm sees it, so a tick costs O(N). Returns the (M, 2) chaser
+    positions, the index of the capturing chaser (None if no capture) and
+    the number of mode switches.
+    """
+    runner.update_random()
+    slack = max((c.max_step for c in chasers), default=0.0)
+    index = SpatialHash(CHASER_SPACING, slack=slack).build(chasers)
+    seeing = sum(_sees_runner(c) for c in chasers)
+    mode_switches = 0
+    for chaser in chasers:
+        saw = _sees_runner(chaser)
+        chaser.update(env, runner, chasers, index, others_see_runner=seeing - saw > 0)
+        seeing += _sees_runner(chaser) - saw
+        if chaser.mode_switch:
+            mode_switches += 1
+        env.mark_visited(chaser.pos)
+    chaser_pos = np.array([(c.pos.x, c.pos.y) for c in chasers])
+    
+    any_pursuit = any(chaser.mode == "pursuit" for chaser in chasers)
+    if any_pursuit:
+        for chaser in chasers:
+            if chaser.mode != "pursuit":
+                chaser.mode = "pursuit"
+                chaser.switch_cooldown = chaser.config.join_cooldown
+
+    # Check for capture
+    for i, chaser in enumerate(chasers):
+        if chaser.pos.distance_to(runner.pos) < chaser.radius + runner.radius:
+            return chaser_pos, i, mode_switches
+    return chaser_pos, None, mode_switches
+
+def _sees_runner(chaser):
+    """Whether the chaser's last observation shows the runner"""
+    return chaser.last_state is not None and bool(chaser.last_state[2] > 0.5)
+
+def has_transition(chaser):
+    """Whether the chaser produced an experience this tick"""
+    return chaser.last_state is not None and chaser.last_action is not None
+
+def compute_rewards(env, runner, chasers, capturing_index):
+    """Reward per chaser for this tick (0 for chasers without a transition)"""
+    rewards = np.zeros(len(chasers))
+    bonus = env.rewards
+    captured = capturing_index is not None
+    for i, chaser in enumerate(chasers):
+        if not has_transition(chaser):
+            continue
+        reward = env.get_reward(chaser, runner, chasers)
+        
+        if captured and i == capturing_index:
+            reward += bonus.capture_bonus  # Significant capture bonus
+        
+        # Small shared reward for other chasers
+        elif captured and chaser.mode == "pursuit":
+            reward += bonus.cooperative_bonus  # Cooperative bonus
+        rewards[i] = reward
+    return rewards
+
+def open_renderer(config):
+    """Display session shared by every rendered episode"""
+    return Renderer(config.arena.width, config.arena.height, "Drone Pursuit RL", fps=config.train.render_fps)
+
+def draw_frame(renderer, runner, chasers):
+    """Draw runner, chasers and pursuit lines for one step"""
+    renderer.begin_frame()
+    renderer.circle((255, 0, 0), (int(runner.pos.x), int(runner.pos.y)), runner.radius)
+    
+    for chaser in chasers:
+        if chaser.mode == "pursuit":
+            color = (255, 100, 100)  # Light red
+            renderer.line((255, 0, 0, 100),
+                          (int(chaser.pos.x), int(chaser.pos.y)),
+                          (int(runner.pos.x), int(runner.pos.y)), 2)
+        else:
+            color = (100, 100, 255)  # Light blue
+        
+        renderer.circle(color, (int(chaser.pos.x), int(chaser.pos.y)), chaser.radius)
+    
+    renderer.end_frame()
 
-    return screen, clock, env, runner, chasers
+def main(config=None, headless=False, render_every=0, log_dir="logs", record_traces=False, seed=None,
+         profile=False, profile_every=0, checkpoint_dir=None, resume=None, overrides=()):
+    """Train the RL agent.
 
-def main():
-    logger = MetricsLogger()
-    rl_agent = RLAgent(state_dim=9, action_dim=8)
+    config (utils.config.Config) holds the arena, entity, reward, agent
+    and episode settings; it is saved next to the metrics and in every
+    full snapshot. When None, a resumed run continues with the snapshot's
+    config and a new run uses the defaults. overrides ("section.key=value")
+    are applied on top either way.
+    With headless=True no window is opened, nothing is drawn and the frame
+    cap is skipped; render_every=N still shows every Nth episode.
+    Episode metrics are appended to log_dir/metrics_<start time>.jsonl as
+    they happen and compacted to a matching .npz at the end. With
+    record_traces=True every episode's step trace is saved under
+    log_dir/traces/.
+    Episode k is simulated from seed + k (seed is drawn at random when not
+    given and logged with every episode), so any episode can be re-run
+    with replay_episode().
+    profile=True times each phase of the step loop and logs per-episode
+    p50/p99/total per phase with the episode metrics; profile_every=N also
+    dumps a cProfile of every Nth episode to log_dir/profiles/ (open with
+    pstats or snakeviz).
+    Every train.checkpoint_every episodes a weights-only and a full
+    (resumable, replay buffer included) snapshot are written in the
+    background to checkpoint_dir, keeping the last train.keep_last of each
+    plus the best weights by mean episode reward. resume is a full
+    snapshot path or "latest" to continue an interrupted run; a new run
+    refuses a checkpoint_dir that already holds another run's snapshots.
+    Without checkpoint_dir a new run gets its own model/run_<start time>
+    directory, resume="latest" continues the newest run there and a
+    snapshot path continues in that snapshot's directory.
+    """
+    if checkpoint_dir is None:
+        if resume == "latest":
+            checkpoint_dir = latest_run_dir(RUNS_ROOT)
+            if checkpoint_dir is None:
+                raise FileNotFoundError(f"no run with a full snapshot under {RUNS_ROOT}/ to resume")
+        elif resume:
+            checkpoint_dir = os.path.dirname(resume) or "."
+        else:
+            checkpoint_dir = new_run_dir(RUNS_ROOT)
+    print(f"Checkpoints in {checkpoint_dir}")
+    checkpoints = CheckpointManager(checkpoint_dir, fresh=not resume)
+    snapshot = None
+    if resume:
+        resume_path = checkpoints.latest() if resume == "latest" else resume
+        if resume_path is None:
+            raise FileNotFoundError(f"no full snapshot to resume from in {checkpoint_dir}")
+        snapshot = load_snapshot(resume_path)
+        seed = snapshot.get('seed', seed)
+        if config is None and snapshot.get('config'):
+            config = from_dict(snapshot['config'])
+        print(f"Resuming from {resume_path} (episode {snapshot['episode']})")
+    config = apply_overrides(config or Config(), overrides)
+    train = config.train
+    if seed is None:
+        seed = random.randrange(2**31)
+    checkpoints.keep_last = train.keep_last
+    metrics_path = os.path.join(log_dir, time.strftime("metrics_%Y%m%d-%H%M%S.jsonl"))
+    logger = MetricsLogger(metrics_path)
+    save_config(config, metrics_path[:-len(".jsonl")] + ".config.json")
+    recorder = None
+    if record_traces:
+        trace_dir = os.path.join(log_dir, "traces")
+        os.makedirs(trace_dir, exist_ok=True)
+        recorder = StepRecorder(train.max_steps, num_chasers=3)
+    rl_agent = RLAgent(state_dim=9, action_dim=8, seed=seed, **asdict(config.agent))
+    start_episode = 0
+    if snapshot:
+        rl_agent.restore(snapshot)
+        start_episode = snapshot['episode'] + 1
+        snapshot = None
+    renderer = None
+    timer = PhaseTimer(enabled=profile)
+    if profile_every > 0:
+        profile_dir = os.path.join(log_dir, "profiles")
+        os.makedirs(profile_dir, exist_ok=True)
     
-    for episode in range(NUM_EPISODES):
+    for episode in range(start_episode, train.episodes):
         episode_metrics = {
             'total_reward': 0,
             'steps': 0,
@@ -50,120 +226,217 @@ def main():
             'mode_switches': 0
         }
         q_values = []
+        render = not headless or (render_every > 0 and episode % render_every == 0)
+
         # Initialize new simulation
-        screen, clock, env, runner, chasers = initialize_simulation(rl_agent)
+        episode_seed = seed + episode
+        env, runner, chasers = initialize_simulation(rl_agent, episode_seed, config)
+        if render:
+            renderer = renderer or open_renderer(config)
+            renderer.reset()
         episode_reward = 0
         done = False
+        if recorder:
+            recorder.reset()
+        timer.reset()
+        profiler = None
+        if profile_every > 0 and episode % profile_every == 0:
+            profiler = cProfile.Profile()
+            profiler.enable()
         
-        for step in range(MAX_STEPS):
-            step_metrics = {
-                'q_values': [],
-                'actions': [],
-                'exploration_map': env.exploration_map.copy()
-            }
+        for step in range(train.max_steps):
             # Handle Pygame events (quit signal)
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    return
-            
-            # Update entities
-            runner.update_random()
-            
-            for chaser in chasers:
-                chaser.update(env, runner, [c for c in chasers if c != chaser])
-                if chaser.mode_switch:
-                    episode_metrics['mode_switches'] += 1
-                env.mark_visited(chaser.pos)
+            if render:
+                with timer.span('events'):
+                    if renderer.poll_quit():
+                        renderer.close()
+                        logger.close()
+                        checkpoints.close()
+                        return
             
-            any_pursuit = any(chaser.mode == "pursuit" for chaser in chasers)
-            if any_pursuit:
-                for chaser in chasers:
-                    if chaser.mode != "pursuit":
-                        chaser.mode = "pursuit"
-                        chaser.switch_cooldown = 15
-
-            # Check for capture
-            captured = False
-            capturing_chaser = None
-            
-            for chaser in chasers:
-                if chaser.pos.distance_to(runner.pos) < chaser.radius + runner.radius:
-                    captured = True
-                    capturing_chaser = chaser
-                    episode_metrics['capture_success'] += 1
-                    break
+            with timer.span('simulate'):
+                chaser_pos, capturing_index, mode_switches = simulate_step(env, runner, chasers)
+            episode_metrics['mode_switches'] += mode_switches
+            captured = capturing_index is not None
+            if captured:
+                episode_metrics['capture_success'] += 1
             
             # Store experiences and calculate rewards
-            
-            for chaser in chasers:
-                if chaser.last_state is not None and chaser.last_action is not None:
-                    next_state = env.get_state(chaser, runner, 
-                                             [c for c in chasers if c != chaser])
-                    reward = env.get_reward(chaser, runner, 
-                                          [c for c in chasers if c != chaser])
-                    
-                    if captured and chaser == capturing_chaser:
-                        reward += 100.0  # Significant capture bonus
-                    
-                    # Small shared reward for other chasers
-                    elif captured and chaser.mode == "pursuit":
-                        reward += 20.0  # Cooperative bonus
-                    
-                    rl_agent.store_experience(
-                        chaser.last_state,
-                        chaser.last_action,
-                        reward,
-                        next_state,
-                        captured
-                    )
-                    episode_reward += reward
-            
-                    # with torch.no_grad():
-                    #         q_values.append(torch.max(rl_agent.q_net(torch.FloatTensor(next_state))).item())
+            with timer.span('observe'):
+                next_states = env.get_states(chasers, runner)
+            with timer.span('reward'):
+                step_rewards = compute_rewards(env, runner, chasers, capturing_index)
+            with timer.span('replay_insert'):
+                for i, chaser in enumerate(chasers):
+                    if has_transition(chaser):
+                        reward = step_rewards[i]
+                        rl_agent.store_experience(
+                            chaser.last_state,
+                            chaser.last_action,
+                            reward,
+                            next_states[i],
+                            captured
+                        )
+                        episode_reward += reward
                 
-                    episode_metrics['total_reward'] += reward
+                        # with torch.no_grad():
+                        #         q_values.append(torch.max(rl_agent.q_net(torch.FloatTensor(next_state))).item())
+                    
+                        episode_metrics['total_reward'] += reward
+
+            if recorder:
+                with timer.span('record'):
+                    recorder.record([runner], chasers, chaser_pos, env.exploration_map.flat_cells(chaser_pos),
+                                    step_rewards, capturing_index)
 
             # Train RL agent
-            rl_agent.train()
+            with timer.span('train'):
+                rl_agent.train()
             episode_metrics['steps'] = step + 1
             
             # Render
-            screen.fill((255, 255, 255))
-            pygame.draw.circle(screen, (255, 0, 0), (int(runner.pos.x), int(runner.pos.y)), runner.radius)
-            
-            for chaser in chasers:
-                if chaser.mode == "pursuit":
-                    color = (255, 100, 100)  # Light red
-                    pygame.draw.line(screen, (255, 0, 0, 100), 
-                                   (int(chaser.pos.x), int(chaser.pos.y)),
-                                   (int(runner.pos.x), int(runner.pos.y)), 2)
-                else:
-                    color = (100, 100, 255)  # Light blue
-                
-                pygame.draw.circle(screen, color, (int(chaser.pos.x), int(chaser.pos.y)), chaser.radius)
-            
-            pygame.display.flip()
-            clock.tick(60)
+            if render:
+                with timer.span('render'):
+                    draw_frame(renderer, runner, chasers)
+                with timer.span('frame_wait'):
+                    renderer.tick()
             
             # End episode if captured
             if captured:
                 break
         
-        episode_metrics['explored_percentage'] = len(env.exploration_map) / ((WIDTH//env.cell_size) * (HEIGHT//env.cell_size))
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(profile_dir, f"episode_{episode:05d}.prof"))
+        
+        episode_metrics['explored_cells'] = env.exploration_map.explored_cells
+        episode_metrics['explored_percentage'] = env.exploration_map.coverage()
         episode_metrics['avg_q_value'] = np.mean(q_values) if q_values else 0
+        episode_metrics['seed'] = episode_seed
 
-        logger.log_episode(episode, **episode_metrics)
+        logger.log_episode(episode, **episode_metrics, **timer.summary())
+        if recorder:
+            recorder.save(os.path.join(trace_dir, f"episode_{episode:05d}.npz"), episode=episode,
+                          seed=episode_seed, cell_size=env.cell_size, grid_shape=env.exploration_map.visits.shape,
+                          width=env.width, height=env.height, runner_radius=runner.radius,
+                          chaser_radius=chasers[0].radius)
 
         # Clean up and prepare for next episode
         print(f"Episode {episode + 1}, Reward: {episode_reward:.2f}, Epsilon: {rl_agent.epsilon:.2f}")
-        if episode % 50 == 0 or episode == NUM_EPISODES - 1:
-            logger.save(f"logs/metrics_ep{episode}.json")
-            rl_agent.save(f"model/rl_agent_ep{episode}.pth")
-        pygame.quit()  # Close current window
+        if episode % train.checkpoint_every == 0 or episode == train.episodes - 1:
+            mean_reward = logger.get_stats('total_reward', train.checkpoint_every)
+            checkpoints.save(rl_agent, episode, mean_reward)
+            checkpoints.save(rl_agent, episode, mean_reward, full=True, seed=seed, config=to_dict(config))
         
     # Save final model
-    rl_agent.save("model/chaser_rl_final.pth")
+    rl_agent.save(os.path.join(checkpoint_dir, "chaser_rl_final.pth"))
+    checkpoints.close()
+    logger.close()
+    compact(metrics_path)
+    if renderer:
+        renderer.close()
+
+def replay_episode(seed, render=False, trace_path=None, config=None):
+    """Re-run the episode simulated from seed and return its step trace.
+
+    Chaser behaviour is scripted, so the episode depends only on its seed
+    and config (the one it was trained with), not on the agent's weights.
+    With trace_path the new trace is compared column by column against
+    the saved one; a divergence raises AssertionError naming the first
+    mismatching step.
+    """
+    rl_agent = RLAgent(state_dim=9, action_dim=8, seed=seed)
+    config = config or Config()
+    env, runner, chasers = initialize_simulation(rl_agent, seed, config)
+    renderer = open_renderer(config) if render else None
+    recorder = StepRecorder(config.train.max_steps, num_chasers=len(chasers))
+    for step in range(config.train.max_steps):
+        if renderer and renderer.poll_quit():
+            break
+        chaser_pos, capturing_index, _ = simulate_step(env, runner, chasers)
+        step_rewards = compute_rewards(env, runner, chasers, capturing_index)
+        recorder.record([runner], chasers, chaser_pos, env.exploration_map.flat_cells(chaser_pos),
+                        step_rewards, capturing_index)
+        if renderer:
+            draw_frame(renderer, runner, chasers)
+            renderer.tick()
+        if capturing_index is not None:
+            break
+    if renderer:
+        renderer.close()
+
+    trace = recorder.columns()
+    if trace_path:
+        saved = load_trace(trace_path)
+        for name, column in trace.items():
+            expected = saved[name]
+            n = min(len(column), len(expected))
+            mismatch = np.flatnonzero([not np.array_equal(column[t], expected[t]) for t in range(n)])
+            if len(mismatch):
+                raise AssertionError(f"replay of seed {seed} diverges from {trace_path} "
+                                     f"at step {mismatch[0]} ({name})")
+            if len(column) != len(expected):
+                raise AssertionError(f"replay of seed {seed} ran {len(column)} steps, "
+                                     f"{trace_path} has {len(expected)}")
+        print(f"Replay of seed {seed} matches {trace_path} ({len(trace['captured'])} steps)")
+    return trace
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train the drone pursuit RL agent",
+                                     epilog="--episodes, --prioritized, --batch-size, --grad-steps, --threads, "
+                                            "--bf16, --checkpoint-every and --keep-last override the config.")
+    add_config_args(parser)
+    parser.add_argument("--episodes", type=int, default=None)
+    parser.add_argument("--headless", action="store_true",
+                        help="no window, no drawing and no frame cap")
+    parser.add_argument("--render-every", type=int, default=0,
+                        help="in headless mode, still render every Nth episode")
+    parser.add_argument("--prioritized", action="store_true", default=None,
+                        help="use prioritized experience replay")
+    parser.add_argument("--log-dir", default="logs")
+    parser.add_argument("--record-traces", action="store_true",
+                        help="save a step-level .npz trace of every episode")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="base seed; episode k uses seed + k")
+    parser.add_argument("--replay-seed", type=int, default=None,
+                        help="re-run the episode with this seed instead of training")
+    parser.add_argument("--replay-trace", default=None,
+                        help="with --replay-seed, check the replay against this saved trace")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--grad-steps", type=int, default=None, help="gradient updates per env step")
+    parser.add_argument("--threads", type=int, default=None, help="torch intra-op threads")
+    parser.add_argument("--bf16", action="store_true", default=None,
+                        help="bfloat16 autocast for the forward passes")
+    parser.add_argument("--checkpoint-dir", default=None,
+                        help="one run per directory; a new run refuses one that already holds snapshots "
+                             "(default: a new model/run_<start time>, or the one being resumed)")
+    parser.add_argument("--checkpoint-every", type=int, default=None)
+    parser.add_argument("--keep-last", type=int, default=None,
+                        help="snapshots of each kind kept besides the best one")
+    parser.add_argument("--resume", default=None,
+                        help='full snapshot to resume training from, or "latest"')
+    parser.add_argument("--profile", action="store_true",
+                        help="log per-phase step loop timings with the episode metrics")
+    parser.add_argument("--profile-every", type=int, default=0,
+                        help="dump a cProfile of every Nth episode to <log-dir>/profiles/")
+    return parser.parse_args()
+
+def config_overrides(args):
+    """--set overrides followed by those of the dedicated flags that were given"""
+    flags = {'train.episodes': args.episodes, 'train.checkpoint_every': args.checkpoint_every,
+             'train.keep_last': args.keep_last, 'agent.prioritized': args.prioritized,
+             'agent.batch_size': args.batch_size, 'agent.grad_steps': args.grad_steps,
+             'agent.num_threads': args.threads, 'agent.bf16': args.bf16}
+    return list(args.overrides) + [f"{key}={value}" for key, value in flags.items() if value is not None]
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    # Without --config, --resume continues with the snapshot's config (plus any overrides)
+    config = load_config(args.config) if args.config or not args.resume else None
+    overrides = config_overrides(args)
+    if args.replay_seed is not None:
+        replay_episode(args.replay_seed, render=not args.headless, trace_path=args.replay_trace,
+                       config=apply_overrides(config or Config(), overrides))
+    else:
+        main(config, args.headless, args.render_every, args.log_dir, args.record_traces, args.seed,
+             args.profile, args.profile_every, args.checkpoint_dir, args.resume, overrides)
\ No newline at end of file
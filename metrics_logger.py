@@ -1,19 +1,33 @@
 import json
+import os
 import time
 import numpy as np
 from collections import defaultdict
 
 class MetricsLogger:
-    def __init__(self):
+    def __init__(self, stream_path=None, fsync=False):
+        """stream_path: optional JSON Lines file that gets one record appended per episode"""
         self.metrics = defaultdict(list)
         self.start_time = time.time()
         self.episode_data = {}
+        self.stream_path = stream_path
+        self.fsync = fsync
+        self._stream = None
+        if stream_path:
+            os.makedirs(os.path.dirname(stream_path) or ".", exist_ok=True)
+            self._stream = open(stream_path, 'a')
         
     def log_episode(self, episode, **kwargs):
         """Record all episode-level metrics"""
         self.episode_data[episode] = kwargs
         for k, v in kwargs.items():
             self.metrics[k].append(v)
+        if self._stream:
+            record = {'episode': episode, 'elapsed': time.time() - self.start_time, **kwargs}
+            self._stream.write(json.dumps(record, separators=(',', ':'), default=_to_builtin) + '\n')
+            self._stream.flush()
+            if self.fsync:
+                os.fsync(self._stream.fileno())
         
     def log_step(self, step_data):
         """Record step-level details"""
@@ -35,4 +49,55 @@ class MetricsLogger:
                 'episode_data': self.episode_data,
                 'aggregated_metrics': dict(self.metrics),
                 'training_duration': time.time() - self.start_time
-            }, f, indent=2)
\ No newline at end of file
+            }, f, indent=2, default=_to_builtin)
+
+    def close(self):
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+
+
+def _to_builtin(value):
+    """json.dumps fallback for NumPy scalars and arrays"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value.item()
+
+
+def read_jsonl(path):
+    """Yield episode records from a metrics stream, skipping a torn last line after a crash"""
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def columns_from_records(records):
+    """Episode-sorted columns from {episode: record}: an int64 'episode' plus one float64 array per numeric metric.
+
+    Missing values become NaN and non-numeric fields are dropped.
+    """
+    episodes = sorted(records)
+    columns = {'episode': np.array(episodes, dtype=np.int64)}
+    keys = sorted({k for r in records.values() for k in r} - {'episode'})
+    for k in keys:
+        values = [records[e].get(k) for e in episodes]
+        if all(v is None or isinstance(v, (int, float)) for v in values):
+            columns[k] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    return columns
+
+
+def compact(jsonl_path, out_path=None):
+    """Convert a metrics stream into one columnar .npz (see columns_from_records).
+
+    Episodes are deduplicated, the last record of an episode winning.
+    """
+    columns = columns_from_records({r['episode']: r for r in read_jsonl(jsonl_path)})
+    out_path = out_path or os.path.splitext(jsonl_path)[0] + '.npz'
+    np.savez_compressed(out_path, **columns)
+    return out_path
\ No newline at end of file
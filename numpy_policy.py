@@ -0,0 +1,52 @@
+import numpy as np
+
+# Layers of QNetwork.net that hold weights (the others are ReLUs)
+LINEAR_LAYERS = (0, 2, 4)
+
+
+class NumpyQNetwork:
+    """QNetwork forward pass in plain NumPy: three matmuls with ReLUs in between.
+
+    Loads the .npz written by export_policy.py and never imports torch, so
+    deployed chasers start fast and stay small.
+    """
+    def __init__(self, weights, biases):
+        # Stored transposed (in, out) so the forward pass is x @ W + b
+        self.weights = [np.ascontiguousarray(w.T, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls([data[f'net.{i}.weight'] for i in LINEAR_LAYERS],
+                       [data[f'net.{i}.bias'] for i in LINEAR_LAYERS])
+
+    @property
+    def state_dim(self):
+        return self.weights[0].shape[0]
+
+    @property
+    def action_dim(self):
+        return self.weights[-1].shape[1]
+
+    def forward(self, states):
+        """Q-values for a single state (state_dim,) or a batch (N, state_dim)"""
+        x = np.asarray(states, dtype=np.float32)
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w
+            x += b
+            if i < last:
+                np.maximum(x, 0, out=x)
+        return x
+
+    __call__ = forward
+
+    def select_actions(self, states, epsilon=0.0, rng=None):
+        """Epsilon-greedy actions for a batch of states (greedy when epsilon is 0)"""
+        actions = self.forward(states).argmax(axis=-1)
+        if epsilon > 0:
+            rng = rng or np.random.default_rng()
+            explore = rng.random(actions.shape) < epsilon
+            actions[explore] = rng.integers(0, self.action_dim, int(explore.sum()))
+        return actions
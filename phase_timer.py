@@ -0,0 +1,56 @@
+import time
+from contextlib import contextmanager, nullcontext
+import numpy as np
+
+
+def latency_stats(samples):
+    """Latency percentiles (milliseconds) of a list of durations in seconds"""
+    ms = np.asarray(samples, dtype=np.float64) * 1e3
+    if not len(ms):
+        return {'n': 0}
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    return {'n': len(ms), 'mean_ms': float(ms.mean()), 'p50_ms': float(p50), 'p90_ms': float(p90),
+            'p99_ms': float(p99), 'max_ms': float(ms.max())}
+
+
+class PhaseTimer:
+    """Named wall-clock spans, filled with (nestable) `with timer.span('name'):` blocks.
+
+    A disabled timer hands out a shared no-op context, so spans can stay in
+    the hot loop at near-zero cost when profiling is off.
+    """
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.samples = {}
+        self._noop = nullcontext()
+
+    def span(self, name):
+        if not self.enabled:
+            return self._noop
+        return self._span(name)
+
+    @contextmanager
+    def _span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.setdefault(name, []).append(time.perf_counter() - start)
+
+    def reset(self):
+        self.samples = {}
+
+    def stats(self):
+        """{phase: latency_stats} of everything recorded since the last reset"""
+        return {name: latency_stats(s) for name, s in self.samples.items()}
+
+    def summary(self):
+        """Flat per-phase p50/p99 (ms) and total (s), ready for MetricsLogger.log_episode"""
+        out = {}
+        for name, s in self.samples.items():
+            ms = np.asarray(s) * 1e3
+            p50, p99 = np.percentile(ms, [50, 99])
+            out[f'phase_{name}_p50_ms'] = float(p50)
+            out[f'phase_{name}_p99_ms'] = float(p99)
+            out[f'phase_{name}_total_s'] = float(ms.sum() / 1e3)
+        return out
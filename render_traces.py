@@ -0,0 +1,153 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # offscreen only, never opens a window
+import argparse
+import glob
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pygame
+from step_recorder import load_trace
+from swarm_core import PURSUIT
+from utils.params import WIDTH, HEIGHT
+
+RUNNER_COLOR = (255, 0, 0)
+PURSUIT_COLOR = (255, 100, 100)
+EXPLORATION_COLOR = (100, 100, 255)
+VISITED_COLOR = (235, 235, 235)
+DRONE_RADIUS = 15  # for traces that predate the recorded radii
+FORMATS = ('frames', 'mp4', 'gif')
+
+
+class TraceRenderer:
+    """Draws the steps of a recorded trace onto an offscreen surface, like main_rl.draw_frame.
+
+    With show_exploration, cells are shaded as the trace first visits them.
+    Visits are painted incrementally onto a persistent layer, so each frame
+    costs the same whatever the step. Arena size and entity radii come from
+    the trace (older traces without them use the utils.params defaults).
+    """
+    def __init__(self, trace, scale=1.0, show_exploration=False):
+        self.trace = trace
+        self.scale = scale
+        width, height = int(trace.get('width', WIDTH)), int(trace.get('height', HEIGHT))
+        self.size = (int(width * scale), int(height * scale))
+        self.runner_radius = max(1, int(float(trace.get('runner_radius', DRONE_RADIUS)) * scale))
+        self.chaser_radius = max(1, int(float(trace.get('chaser_radius', DRONE_RADIUS)) * scale))
+        self.surface = pygame.Surface(self.size)
+        self.background = pygame.Surface(self.size)
+        self.background.fill((255, 255, 255))
+        self.show_exploration = show_exploration and 'grid_shape' in trace
+        if self.show_exploration:
+            self.cell_size = float(trace['cell_size'])
+            self.rows = int(trace['grid_shape'][1])
+            self.seen = np.zeros(int(np.prod(trace['grid_shape'])), dtype=bool)
+        self.next_step = 0
+
+    def _paint_visits(self, step):
+        cells = self.trace['visited_cells'][step]
+        for cell in cells[cells >= 0]:
+            if not self.seen[cell]:
+                self.seen[cell] = True
+                col, row = divmod(int(cell), self.rows)
+                size = self.cell_size * self.scale
+                pygame.draw.rect(self.background, VISITED_COLOR,
+                                 (col * size, row * size, int(size) + 1, int(size) + 1))
+
+    def draw(self, step):
+        """Render one step; steps must be requested in increasing order"""
+        if self.show_exploration:
+            for t in range(self.next_step, step + 1):
+                self._paint_visits(t)
+        self.next_step = step + 1
+
+        s = self.scale
+        surface = self.surface
+        surface.blit(self.background, (0, 0))
+        runner = self.trace['runner_pos'][step] * s
+        for rx, ry in runner:
+            pygame.draw.circle(surface, RUNNER_COLOR, (int(rx), int(ry)), self.runner_radius)
+        for (cx, cy), mode in zip(self.trace['chaser_pos'][step] * s, self.trace['modes'][step]):
+            if mode == PURSUIT:
+                color = PURSUIT_COLOR
+                pygame.draw.line(surface, RUNNER_COLOR, (int(cx), int(cy)),
+                                 (int(runner[0, 0]), int(runner[0, 1])), max(1, int(2 * s)))
+            else:
+                color = EXPLORATION_COLOR
+            pygame.draw.circle(surface, color, (int(cx), int(cy)), self.chaser_radius)
+        return surface
+
+    def rgb(self, step):
+        """Step as an (H, W, 3) uint8 array"""
+        surface = self.draw(step)
+        return np.frombuffer(pygame.image.tobytes(surface, 'RGB'), dtype=np.uint8).reshape(
+            self.size[1], self.size[0], 3)
+
+
+def _write_video(renderer, steps, path, fps):
+    """Stream frames to an MP4/GIF with imageio, or build a GIF with Pillow if imageio is missing"""
+    try:
+        import imageio
+    except ImportError:
+        imageio = None
+    if imageio is not None:
+        with imageio.get_writer(path, fps=fps) as writer:
+            for step in steps:
+                writer.append_data(renderer.rgb(step))
+        return
+    if not path.endswith('.gif'):
+        raise ImportError("MP4 export needs imageio (pip install imageio imageio-ffmpeg); "
+                          "use --format gif or frames instead")
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("GIF export needs imageio or Pillow (pip install imageio or pip install pillow); "
+                          "use --format frames instead") from None
+    frames = [Image.fromarray(renderer.rgb(step)).quantize() for step in steps]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=int(1000 / fps), loop=0)
+
+
+def render_trace(trace_path, out_dir, fmt='frames', fps=30, every=1, scale=0.5, show_exploration=False):
+    """Render one trace file to out_dir as PNG frames, an MP4 or a GIF; returns the output path"""
+    trace = load_trace(trace_path)
+    renderer = TraceRenderer(trace, scale, show_exploration)
+    steps = range(0, len(trace['captured']), every)
+    name = os.path.splitext(os.path.basename(trace_path))[0]
+    os.makedirs(out_dir, exist_ok=True)
+
+    if fmt == 'frames':
+        frame_dir = os.path.join(out_dir, name)
+        os.makedirs(frame_dir, exist_ok=True)
+        for step in steps:
+            pygame.image.save(renderer.draw(step), os.path.join(frame_dir, f"{step:05d}.png"))
+        return frame_dir
+    path = os.path.join(out_dir, f"{name}.{fmt}")
+    _write_video(renderer, steps, path, fps)
+    return path
+
+
+def render_traces(trace_paths, out_dir, workers=None, **options):
+    """Render many traces in parallel worker processes, independently of any training run"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_trace, path, out_dir, **options) for path in trace_paths]
+        for path, future in zip(trace_paths, futures):
+            print(f"{path} -> {future.result()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render recorded episode traces offscreen to frames or video")
+    parser.add_argument("traces", nargs="+", help="trace .npz files or directories of them")
+    parser.add_argument("--out-dir", default="videos")
+    parser.add_argument("--format", choices=FORMATS, default="frames",
+                        help="PNG frames need only pygame; mp4 needs imageio and imageio-ffmpeg, "
+                             "gif imageio or Pillow")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--every", type=int, default=1, help="render every Nth step")
+    parser.add_argument("--scale", type=float, default=0.5, help="output size relative to the recorded arena")
+    parser.add_argument("--show-exploration", action="store_true", help="shade visited cells")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    paths = []
+    for p in args.traces:
+        paths.extend(sorted(glob.glob(os.path.join(p, "*.npz"))) if os.path.isdir(p) else [p])
+    render_traces(paths, args.out_dir, args.workers, fmt=args.format, fps=args.fps, every=args.every,
+                  scale=args.scale, show_exploration=args.show_exploration)
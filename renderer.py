@@ -0,0 +1,70 @@
+import pygame
+from utils.colors import WHITE, GRAY
+
+
+class Renderer:
+    """One pygame display session reused across episodes, redrawn with dirty rectangles.
+
+    The static layer (background fill and optional grid) is rendered once
+    into an off-screen surface. Each frame restores only the areas drawn in
+    the previous frame from that layer. It then draws the moving entities
+    and pushes just the old and new rectangles to the display.
+    """
+    def __init__(self, width, height, caption, background=WHITE, grid_spacing=None, grid_color=GRAY, fps=60):
+        pygame.init()
+        self.screen = pygame.display.set_mode((width, height))
+        pygame.display.set_caption(caption)
+        self.clock = pygame.time.Clock()
+        self.fps = fps
+
+        self.background = pygame.Surface((width, height)).convert()
+        self.background.fill(background)
+        if grid_spacing:
+            for x in range(0, width, grid_spacing):
+                pygame.draw.line(self.background, grid_color, (x, 0), (x, height), 1)
+            for y in range(0, height, grid_spacing):
+                pygame.draw.line(self.background, grid_color, (0, y), (width, y), 1)
+
+        self._previous = []
+        self._drawn = []
+        self.reset()
+
+    def reset(self):
+        """Show the bare static layer, e.g. at the start of an episode"""
+        self.screen.blit(self.background, (0, 0))
+        pygame.display.flip()
+        self._previous = []
+        self._drawn = []
+
+    def poll_quit(self):
+        """Process pending window events; True if the window was closed"""
+        return any(event.type == pygame.QUIT for event in pygame.event.get())
+
+    def begin_frame(self):
+        """Erase last frame's drawings by restoring the static layer underneath them"""
+        for rect in self._previous:
+            self.screen.blit(self.background, rect, rect)
+        self._drawn = []
+
+    def add(self, rect):
+        """Mark a rectangle returned by a pygame.draw call (or an entity's draw) as dirty"""
+        if rect is not None:
+            self._drawn.append(rect.inflate(2, 2))
+
+    def circle(self, color, center, radius, width=0):
+        self.add(pygame.draw.circle(self.screen, color, center, radius, width))
+
+    def line(self, color, start, end, width=1):
+        self.add(pygame.draw.line(self.screen, color, start, end, width))
+
+    def end_frame(self):
+        """Push only the erased and newly drawn rectangles to the display"""
+        pygame.display.update(self._previous + self._drawn)
+        self._previous = self._drawn
+
+    def tick(self):
+        """Wait to cap the frame rate at fps"""
+        self.clock.tick(self.fps)
+
+    def close(self):
+        pygame.quit()
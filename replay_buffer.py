@@ -0,0 +1,181 @@
+import numpy as np
+import torch
+
+
+class ReplayBuffer:
+    """Fixed-capacity ring buffer of transitions stored in preallocated arrays"""
+    def __init__(self, capacity, state_dim, seed=None):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_dim), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        self.pos = 0
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
+        self._batch = {}
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, done):
+        i = self.pos
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.pos = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return i
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        """Append a batch of transitions, wrapping around the end of the ring"""
+        n = len(actions)
+        if n > self.capacity:
+            states, actions, rewards, next_states, dones = (
+                a[-self.capacity:] for a in (states, actions, rewards, next_states, dones))
+            n = self.capacity
+        idx = (self.pos + np.arange(n)) % self.capacity
+        self.states[idx] = states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = next_states
+        self.dones[idx] = dones
+        self.pos = (self.pos + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        return idx
+
+    def sample_indices(self, batch_size):
+        return self.rng.integers(0, self.size, size=batch_size)
+
+    def get(self, idx):
+        """Gather a batch into reused arrays and wrap them with torch.from_numpy.
+
+        The returned tensors share memory with buffers that the next call
+        overwrites, so use them before sampling again.
+        """
+        n = len(idx)
+        if n not in self._batch:
+            self._batch[n] = tuple(np.empty((n,) + a.shape[1:], dtype=a.dtype) for a in self._columns())
+        out = self._batch[n]
+        for column, dest in zip(self._columns(), out):
+            np.take(column, idx, axis=0, out=dest)
+        return tuple(torch.from_numpy(a) for a in out)
+
+    def _columns(self):
+        return self.states, self.actions, self.rewards, self.next_states, self.dones
+
+    def sample(self, batch_size):
+        return self.get(self.sample_indices(batch_size))
+
+    def state_dict(self):
+        """Copy of the stored transitions and sampler state, as tensors so torch.load(weights_only=True) accepts it"""
+        n = self.size
+        return {
+            'capacity': self.capacity,
+            'pos': self.pos,
+            'size': n,
+            'columns': [torch.from_numpy(a[:n].copy()) for a in self._columns()],
+            'rng': self.rng.bit_generator.state,
+        }
+
+    def load_state_dict(self, state):
+        if state['capacity'] != self.capacity:
+            raise ValueError(f"replay buffer capacity {self.capacity} does not match snapshot ({state['capacity']})")
+        n = state['size']
+        for column, saved in zip(self._columns(), state['columns']):
+            column[:n] = saved.numpy()
+        self.pos = state['pos']
+        self.size = n
+        self.rng.bit_generator.state = state['rng']
+
+
+class SumTree:
+    """Binary tree where each parent holds the sum of its children's priorities"""
+    def __init__(self, capacity):
+        self.leaves = 1
+        while self.leaves < capacity:
+            self.leaves *= 2
+        self.tree = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    def total(self):
+        return self.tree[1]
+
+    def update(self, idx, priorities):
+        """Set leaf priorities and refresh their ancestors, O(k log n)"""
+        nodes = np.asarray(idx) + self.leaves
+        self.tree[nodes] = priorities
+        while nodes[0] > 1:
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Leaf index whose cumulative priority range contains each value"""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self.leaves:
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = values > left_sum
+            values = np.where(go_right, values - left_sum, values)
+            nodes = np.where(go_right, left + 1, left)
+        return nodes - self.leaves
+
+    def get(self, idx):
+        return self.tree[np.asarray(idx) + self.leaves]
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """Proportional prioritized replay (Schaul et al.) backed by a SumTree"""
+    def __init__(self, capacity, state_dim, alpha=0.6, beta=0.4, beta_increment=1e-4, eps=1e-5, seed=None):
+        super().__init__(capacity, state_dim, seed)
+        self.tree = SumTree(capacity)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.eps = eps
+        self.max_priority = 1.0
+
+    def add(self, state, action, reward, next_state, done):
+        i = super().add(state, action, reward, next_state, done)
+        self.tree.update([i], self.max_priority ** self.alpha)
+        return i
+
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        idx = super().add_batch(states, actions, rewards, next_states, dones)
+        self.tree.update(idx, self.max_priority ** self.alpha)
+        return idx
+
+    def sample_indices(self, batch_size):
+        """Stratified sampling proportional to priority"""
+        total = self.tree.total()
+        segment = total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        idx = self.tree.find(np.minimum(values, total * (1 - 1e-12)))
+        return np.minimum(idx, self.size - 1)
+
+    def importance_weights(self, idx):
+        """Normalized importance-sampling weights for sampled indices; anneals beta toward 1"""
+        probs = self.tree.get(idx) / self.tree.total()
+        weights = (self.size * probs) ** -self.beta
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return torch.from_numpy(weights.astype(np.float32))
+
+    def state_dict(self):
+        state = super().state_dict()
+        state.update(tree=torch.from_numpy(self.tree.tree.copy()), beta=self.beta, max_priority=self.max_priority)
+        return state
+
+    def load_state_dict(self, state):
+        super().load_state_dict(state)
+        self.tree.tree[:] = state['tree'].numpy()
+        self.beta = state['beta']
+        self.max_priority = state['max_priority']
+
+    def update_priorities(self, idx, td_errors):
+        priorities = np.abs(td_errors) + self.eps
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(idx, priorities ** self.alpha)
@@ -2,50 +2,56 @@ import pygame
 import math
 import random
 import numpy as np
-from utils.params import RUNNER_MAX_SPEED, RUNNER_STEERING_STRENGTH, RUNNER_SMOOTHNESS, SENSE_RADIUS, BORDER_MARGIN, WIDTH, HEIGHT
+from utils.config import RunnerConfig, ArenaConfig
 
 class Runner:
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=None, config=None, arena=None):
+        config = config or RunnerConfig()
+        self.arena = arena or ArenaConfig()
+        self.rng = rng or random  # random.Random for reproducible runs
         self.pos = pygame.Vector2(x, y)
-        self.velocity = pygame.Vector2(random.uniform(-1, 1), 
-                                     random.uniform(-1, 1)).normalize() * 0.5
+        self.velocity = pygame.Vector2(self.rng.uniform(-1, 1), 
+                                     self.rng.uniform(-1, 1)).normalize() * 0.5
         self.color = (255, 0, 0)
-        self.radius = 15
-        self.max_speed = RUNNER_MAX_SPEED
-        self.steering_strength = RUNNER_STEERING_STRENGTH  # Lower = smoother turns
-        self.border_margin = 80
+        self.radius = config.radius
+        self.max_speed = config.max_speed
+        self.steering_strength = config.steering_strength  # Lower = smoother turns
+        self.border_margin = self.arena.border_margin
         self.target_velocity = self.velocity.copy()
-        self.smoothness = RUNNER_SMOOTHNESS  # 0-1, higher = smoother direction changes
+        self.smoothness = config.smoothness  # 0-1, higher = smoother direction changes
 
     def _get_new_direction(self):
         """Generates smoothly changing target direction"""
-        angle_change = random.gauss(0, 15) * (1 - self.smoothness)
+        angle_change = self.rng.gauss(0, 15) * (1 - self.smoothness)
         return self.target_velocity.rotate(angle_change).normalize()
 
     def update_random(self):
         # Gradually update target velocity
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             self.target_velocity = self._get_new_direction() * self.max_speed
         
         # Smooth steering toward target velocity
         self.velocity += (self.target_velocity - self.velocity) * self.steering_strength
         
-        if self.pos.x < BORDER_MARGIN:
+        if self.pos.x < self.border_margin:
             self.target_velocity.x = abs(self.target_velocity.x)
-        elif self.pos.x > WIDTH - BORDER_MARGIN:
+        elif self.pos.x > self.arena.width - self.border_margin:
             self.target_velocity.x = -abs(self.target_velocity.x)
 
-        if self.pos.y < BORDER_MARGIN:
+        if self.pos.y < self.border_margin:
             self.target_velocity.y = abs(self.target_velocity.y)
-        elif self.pos.y > HEIGHT - BORDER_MARGIN:
+        elif self.pos.y > self.arena.height - self.border_margin:
             self.target_velocity.y = -abs(self.target_velocity.y)
         
         # Update position
         self.pos += self.velocity
 
-    def update_with_avoidance(self, chasers):
-        # Check for nearby chasers
-        threats = [c for c in chasers if self.pos.distance_to(c.pos) <= SENSE_RADIUS]
+    def update_with_avoidance(self, chasers, index=None):
+        # Check for nearby chasers (index: optional SpatialHash over chasers)
+        if index is not None:
+            threats = index.query_radius(self.pos, self.arena.sense_radius)
+        else:
+            threats = [c for c in chasers if self.pos.distance_to(c.pos) <= self.arena.sense_radius]
         
         if threats:
             # Compute total repulsion vector
@@ -60,23 +66,23 @@ class Runner:
                 self.target_velocity = repulsion.normalize() * self.max_speed
         else:
             # If no threats, continue random wandering
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 self.target_velocity = self._get_new_direction() * self.max_speed
 
         # Smooth steering toward target velocity
         self.velocity += (self.target_velocity - self.velocity) * self.steering_strength
 
-        if self.pos.x < BORDER_MARGIN:
+        if self.pos.x < self.border_margin:
             self.target_velocity.x = abs(self.target_velocity.x)
             print("border1")
-        elif self.pos.x > WIDTH - BORDER_MARGIN:
+        elif self.pos.x > self.arena.width - self.border_margin:
             self.target_velocity.x = -abs(self.target_velocity.x)
             print("border2")
 
-        if self.pos.y < BORDER_MARGIN:
+        if self.pos.y < self.border_margin:
             self.target_velocity.y = abs(self.target_velocity.y)
             print("border3")
-        elif self.pos.y > HEIGHT - BORDER_MARGIN:
+        elif self.pos.y > self.arena.height - self.border_margin:
             self.target_velocity.y = -abs(self.target_velocity.y)
             print("border4")
 
@@ -87,8 +93,9 @@ class Runner:
         return self.pos.copy()
 
     def draw(self, surface):
-        pygame.draw.circle(surface, self.color, (int(self.pos.x), int(self.pos.y)), self.radius)
+        """Draw the runner; returns the bounding rect of what was drawn"""
+        rect = pygame.draw.circle(surface, self.color, (int(self.pos.x), int(self.pos.y)), self.radius)
         
         # Draw velocity vector (optional visual aid)
         end_pos = self.pos + self.velocity * 20
-        pygame.draw.line(surface, (200, 0, 0), self.pos, end_pos, 2)
\ No newline at end of file
+        return rect.union(pygame.draw.line(surface, (200, 0, 0), self.pos, end_pos, 2))
\ No newline at end of file
@@ -0,0 +1,280 @@
+import argparse
+import os
+import random
+import time
+import numpy as np
+import pygame
+from drone_env import DroneEnv, PROBE_OFFSETS
+from runner import Runner
+from chaser_intelligent import create_ring_formation
+from chaser_rl import RLAgent
+from spatial_index import SpatialHash
+from dataclasses import asdict
+from metrics_logger import MetricsLogger, compact
+from main_rl import is_far_from_chasers, has_transition
+from renderer import Renderer
+from utils.config import Config, add_config_args, load_config, save_config
+from utils.params import CHASER_SPACING
+
+
+def observation_dim(k_nearest):
+    """k runner slots (dx, dy, visible), 4 exploration probes, nearest chaser (dx, dy)"""
+    return 3 * k_nearest + 6
+
+
+class Scenario:
+    """Pursuit episode with any number of runners and chasers.
+
+    Each chaser observes its k nearest visible runners in fixed slots
+    (nearest first, zero-padded), so the observation size does not depend
+    on the number of runners. With k_nearest=1 the layout is the same as
+    DroneEnv.get_state. Runners and chasers are bucketed in spatial hashes
+    each tick, so a step costs O(N + M) for bounded local density.
+
+    Runners are captured individually. A captured runner is removed from
+    play and recorded in capture_step / captured_by, and the episode is
+    done once every runner is caught. Arena, entities and rewards come
+    from config (defaults when None).
+    """
+    def __init__(self, num_runners=1, num_chasers=3, k_nearest=1, rl_agent=None, seed=None, config=None):
+        config = config or Config()
+        arena = config.arena
+        width, height, sense_radius = arena.width, arena.height, arena.sense_radius
+        self.rng = random.Random(seed)
+        self.k_nearest = k_nearest
+        self.sense_radius = sense_radius
+        self.env = DroneEnv(width, height, sense_radius, arena.cell_size, config.reward, arena.frontier_margin)
+        self.chasers = create_ring_formation(pygame.Vector2(width // 2, height // 2), config.chaser.formation_radius,
+                                             rl_agent, num_chasers, self.rng, config.chaser, arena)
+        self.runners = []
+        for _ in range(num_runners):
+            while True:
+                pos = pygame.Vector2(self.rng.randint(50, width - 50), self.rng.randint(50, height - 50))
+                if is_far_from_chasers(pos, self.chasers, sense_radius):
+                    break
+            self.runners.append(Runner(pos.x, pos.y, self.rng, config.runner, arena))
+
+        self.active = [True] * num_runners
+        self.capture_step = [-1] * num_runners
+        self.captured_by = [-1] * num_runners
+        self.steps = 0
+        self.targets = [None] * num_chasers
+        self._chaser_ids = {id(c): i for i, c in enumerate(self.chasers)}
+        self._runner_index = SpatialHash(sense_radius)
+        # Small cells: chasers can be dense, and only nearest/capture queries hit this index
+        self._chaser_index = SpatialHash(CHASER_SPACING)
+        self._capture_reach = max((c.radius for c in self.chasers), default=0)
+        self._obs = None
+
+    @property
+    def state_dim(self):
+        return observation_dim(self.k_nearest)
+
+    @property
+    def done(self):
+        return not any(self.active)
+
+    @property
+    def runners_captured(self):
+        return len(self.active) - sum(self.active)
+
+    def active_runners(self):
+        return [r for r, active in zip(self.runners, self.active) if active]
+
+    def observe(self):
+        """(M, state_dim) observations of all chasers, cached until the next step().
+
+        Also sets targets[i] to the nearest runner chaser i can see (or None).
+        """
+        if self._obs is not None:
+            return self._obs
+        chasers, k, radius = self.chasers, self.k_nearest, self.sense_radius
+        self._runner_index.build(self.active_runners())
+        self._chaser_index.build(chasers)
+        obs = np.zeros((len(chasers), self.state_dim), dtype=np.float32)
+
+        for i, chaser in enumerate(chasers):
+            visible = self._runner_index.query_radius(chaser.pos, radius)
+            visible.sort(key=lambda r: chaser.pos.distance_squared_to(r.pos))
+            self.targets[i] = visible[0] if visible else None
+            for j, runner in enumerate(visible[:k]):
+                rel = (runner.pos - chaser.pos) / radius
+                obs[i, 3 * j:3 * j + 3] = (rel.x, rel.y, 1.0)
+            nearest = self._chaser_index.nearest(chaser.pos, radius, exclude=chaser)
+            if nearest is not None:
+                rel = (nearest.pos - chaser.pos) / radius
+                obs[i, 3 * k + 4:3 * k + 6] = (rel.x, rel.y)
+
+        pos = np.array([(c.pos.x, c.pos.y) for c in chasers]).reshape(-1, 2)
+        probes = (pos[:, None, :] + PROBE_OFFSETS[None, :, :]).reshape(-1, 2)
+        visits = self.env.get_visit_count(probes).reshape(len(chasers), 4)
+        obs[:, 3 * k:3 * k + 4] = np.minimum(visits, 10) / 10
+        self._obs = obs
+        return obs
+
+    def step(self):
+        """Advance one tick: every chaser acts on the same start-of-tick observations, then the runners move.
+
+        Unlike main_rl.simulate_step, chasers do not observe each other's
+        moves within the tick, so one batched observe() serves them all.
+        Chasers that see no runner pursue the runner the swarm sees most
+        closely. Returns ([(runner index, chaser index)] captured this
+        tick, number of mode switches).
+        """
+        obs = self.observe()
+        visible = obs[:, 2] > 0.5
+        swarm_sees_runner = bool(visible.any())
+        shared_target = None
+        if swarm_sees_runner:
+            dist_sq = np.where(visible, obs[:, 0] ** 2 + obs[:, 1] ** 2, np.inf)
+            shared_target = self.targets[int(np.argmin(dist_sq))]
+
+        mode_switches = 0
+        for i, chaser in enumerate(self.chasers):
+            target = self.targets[i] if self.targets[i] is not None else shared_target
+            self.targets[i] = target
+            chaser.act(self.env, obs[i], swarm_sees_runner, target)
+            if chaser.mode_switch:
+                mode_switches += 1
+        self.env.mark_visited(np.array([(c.pos.x, c.pos.y) for c in self.chasers]))
+
+        if any(chaser.mode == "pursuit" for chaser in self.chasers):
+            for chaser in self.chasers:
+                if chaser.mode != "pursuit":
+                    chaser.mode = "pursuit"
+                    chaser.switch_cooldown = chaser.config.join_cooldown
+
+        for runner in self.active_runners():
+            runner.update_random()
+
+        # Per-runner capture, looking only at chasers in the runner's cell neighbourhood
+        captures = []
+        self._chaser_index.build(self.chasers)
+        for j, runner in enumerate(self.runners):
+            if not self.active[j]:
+                continue
+            close = [c for c in self._chaser_index.query_radius(runner.pos, self._capture_reach + runner.radius)
+                     if c.pos.distance_to(runner.pos) < c.radius + runner.radius]
+            if close:
+                catcher = min(close, key=lambda c: c.pos.distance_squared_to(runner.pos))
+                i = self._chaser_ids[id(catcher)]
+                self.active[j] = False
+                self.capture_step[j] = self.steps
+                self.captured_by[j] = i
+                captures.append((j, i))
+
+        self.steps += 1
+        self._obs = None
+        return captures, mode_switches
+
+    def rewards(self, captures):
+        """Per-chaser rewards for this tick: capture bonus per runner caught, cooperative bonus to other pursuers"""
+        bonus = self.env.rewards
+        rewards = np.zeros(len(self.chasers))
+        catches = np.bincount([i for _, i in captures], minlength=len(self.chasers))
+        for i, chaser in enumerate(self.chasers):
+            if not has_transition(chaser):
+                continue
+            reward = self.env.get_reward(chaser, None, None)
+            if catches[i]:
+                reward += bonus.capture_bonus * catches[i]
+            elif captures and chaser.mode == "pursuit":
+                reward += bonus.cooperative_bonus
+            rewards[i] = reward
+        return rewards
+
+
+def draw_scenario(renderer, scenario):
+    """Draw runners (captured ones in grey), chasers and pursuit lines"""
+    renderer.begin_frame()
+    for runner, active in zip(scenario.runners, scenario.active):
+        color = (255, 0, 0) if active else (180, 180, 180)
+        renderer.circle(color, (int(runner.pos.x), int(runner.pos.y)), runner.radius)
+    for chaser, target in zip(scenario.chasers, scenario.targets):
+        if chaser.mode == "pursuit" and target is not None:
+            color = (255, 100, 100)
+            renderer.line((255, 0, 0), (int(chaser.pos.x), int(chaser.pos.y)),
+                          (int(target.pos.x), int(target.pos.y)), 2)
+        else:
+            color = (100, 100, 255)
+        renderer.circle(color, (int(chaser.pos.x), int(chaser.pos.y)), chaser.radius)
+    renderer.end_frame()
+
+
+def main(config=None, num_runners=2, num_chasers=3, k_nearest=2, headless=False, seed=None, log_dir="logs",
+         checkpoint_dir="model"):
+    """Train one shared RLAgent on N-runner / M-chaser episodes (episode k uses seed + k)"""
+    config = config or Config()
+    if seed is None:
+        seed = random.randrange(2**31)
+    rl_agent = RLAgent(state_dim=observation_dim(k_nearest), action_dim=8, seed=seed, **asdict(config.agent))
+    metrics_path = os.path.join(log_dir, time.strftime("scenario_%Y%m%d-%H%M%S.jsonl"))
+    logger = MetricsLogger(metrics_path)
+    save_config(config, metrics_path[:-len(".jsonl")] + ".config.json")
+    renderer = None if headless else Renderer(config.arena.width, config.arena.height, "Drone Pursuit Scenario",
+                                              fps=config.train.render_fps)
+
+    for episode in range(config.train.episodes):
+        scenario = Scenario(num_runners, num_chasers, k_nearest, rl_agent, seed + episode, config)
+        if renderer:
+            renderer.reset()
+        total_reward = 0.0
+        mode_switches = 0
+        for step in range(config.train.max_steps):
+            if renderer and renderer.poll_quit():
+                renderer.close()
+                logger.close()
+                return
+            captures, switches = scenario.step()
+            mode_switches += switches
+            next_states = scenario.observe()
+            rewards = scenario.rewards(captures)
+            for i, chaser in enumerate(scenario.chasers):
+                if has_transition(chaser):
+                    rl_agent.store_experience(chaser.last_state, chaser.last_action, rewards[i],
+                                              next_states[i], scenario.done)
+                    total_reward += rewards[i]
+            rl_agent.train()
+            if renderer:
+                draw_scenario(renderer, scenario)
+                renderer.tick()
+            if scenario.done:
+                break
+
+        captured_steps = [s for s in scenario.capture_step if s >= 0]
+        logger.log_episode(episode, total_reward=total_reward, steps=scenario.steps,
+                           capture_success=int(scenario.done), runners_captured=scenario.runners_captured,
+                           first_capture_step=min(captured_steps) if captured_steps else -1,
+                           mode_switches=mode_switches,
+                           explored_percentage=scenario.env.exploration_map.coverage(), seed=seed + episode)
+        print(f"Episode {episode + 1}, Reward: {total_reward:.2f}, "
+              f"Captured: {scenario.runners_captured}/{num_runners}, Epsilon: {rl_agent.epsilon:.2f}")
+
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    rl_agent.save(os.path.join(checkpoint_dir, "scenario_rl_final.pth"))
+    logger.close()
+    compact(metrics_path)
+    if renderer:
+        renderer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train on pursuit episodes with N runners and M chasers")
+    add_config_args(parser)
+    parser.add_argument("--episodes", type=int, default=None, help="overrides train.episodes")
+    parser.add_argument("--runners", type=int, default=2)
+    parser.add_argument("--chasers", type=int, default=3)
+    parser.add_argument("--k-nearest", type=int, default=2, help="runner slots in each observation")
+    parser.add_argument("--max-steps", type=int, default=None, help="overrides train.max_steps")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--log-dir", default="logs")
+    parser.add_argument("--checkpoint-dir", default="model")
+    args = parser.parse_args()
+    config = load_config(args.config, args.overrides)
+    if args.episodes is not None:
+        config.train.episodes = args.episodes
+    if args.max_steps is not None:
+        config.train.max_steps = args.max_steps
+    main(config, args.runners, args.chasers, args.k_nearest, args.headless, args.seed, args.log_dir,
+         args.checkpoint_dir)
@@ -0,0 +1,79 @@
+import math
+
+
+class SpatialHash:
+    """Uniform-grid bucket index of entities (anything with a pygame.Vector2 .pos).
+
+    Rebuild it once per tick with build(). Entities may keep moving up to
+    slack pixels afterwards and are still found, because queries widen the
+    searched cells by slack and then check exact current distances.
+    """
+    def __init__(self, cell_size, slack=10.0):
+        self.cell_size = cell_size
+        self.slack = slack
+        self.buckets = {}
+
+    def build(self, entities):
+        self.buckets.clear()
+        cs = self.cell_size
+        for e in entities:
+            key = (math.floor(e.pos.x / cs), math.floor(e.pos.y / cs))
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                self.buckets[key] = [e]
+            else:
+                bucket.append(e)
+        return self
+
+    def query_radius(self, pos, radius, exclude=None):
+        """Entities within radius of pos (inclusive), excluding exclude"""
+        cs = self.cell_size
+        reach = radius + self.slack
+        x0, x1 = math.floor((pos[0] - reach) / cs), math.floor((pos[0] + reach) / cs)
+        y0, y1 = math.floor((pos[1] - reach) / cs), math.floor((pos[1] + reach) / cs)
+        radius_sq = radius * radius
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for e in self.buckets.get((cx, cy), ()):
+                    if e is not exclude and e.pos.distance_squared_to(pos) <= radius_sq:
+                        found.append(e)
+        return found
+
+    def nearest(self, pos, radius, exclude=None):
+        """Closest entity within radius of pos, or None.
+
+        Cells are searched in rings of growing Chebyshev distance around
+        pos, stopping as soon as no unvisited ring can hold anything closer,
+        so dense crowds cost about as much as sparse ones.
+        """
+        cs = self.cell_size
+        cx, cy = math.floor(pos[0] / cs), math.floor(pos[1] / cs)
+        max_ring = math.ceil((radius + self.slack) / cs)
+        best, best_sq = None, radius * radius
+        for ring in range(max_ring + 1):
+            # Anything in this ring or beyond is at least (ring - 1) * cs - slack away
+            bound = (ring - 1) * cs - self.slack
+            if best is not None and bound > 0 and bound * bound > best_sq:
+                break
+            for key in _ring_cells(cx, cy, ring):
+                for e in self.buckets.get(key, ()):
+                    if e is exclude:
+                        continue
+                    d = e.pos.distance_squared_to(pos)
+                    if d < best_sq or (d == best_sq and best is None):
+                        best, best_sq = e, d
+        return best
+
+
+def _ring_cells(cx, cy, ring):
+    """Cells at Chebyshev distance exactly ring from (cx, cy)"""
+    if ring == 0:
+        yield (cx, cy)
+        return
+    for x in range(cx - ring, cx + ring + 1):
+        yield (x, cy - ring)
+        yield (x, cy + ring)
+    for y in range(cy - ring + 1, cy + ring):
+        yield (cx - ring, y)
+        yield (cx + ring, y)
@@ -0,0 +1,84 @@
+import numpy as np
+from swarm_core import MODE_CODES
+
+NO_ACTION = -2  # chaser took no RL action this step (last_action is None)
+
+
+class StepRecorder:
+    """Per-episode step trace kept in preallocated NumPy columns.
+
+    Columns (T = recorded steps, M = chasers, R = runners):
+      runner_pos (T, R, 2), chaser_pos (T, M, 2), modes (T, M), actions (T, M),
+      rewards (T, M), captured (T,), capturing_chaser (T,) and visited_cells
+      (T, M). visited_cells holds the flat exploration-grid cell each chaser
+      marked that step (-1 outside the grid): the map is stored as deltas,
+      rebuild it with exploration_map_at().
+    """
+    def __init__(self, max_steps, num_chasers, num_runners=1):
+        self.max_steps = max_steps
+        self.runner_pos = np.zeros((max_steps, num_runners, 2), dtype=np.float32)
+        self.chaser_pos = np.zeros((max_steps, num_chasers, 2), dtype=np.float32)
+        self.modes = np.zeros((max_steps, num_chasers), dtype=np.int8)
+        self.actions = np.full((max_steps, num_chasers), NO_ACTION, dtype=np.int16)
+        self.rewards = np.zeros((max_steps, num_chasers), dtype=np.float32)
+        self.captured = np.zeros(max_steps, dtype=bool)
+        self.capturing_chaser = np.full(max_steps, -1, dtype=np.int8)
+        self.visited_cells = np.full((max_steps, num_chasers), -1, dtype=np.int32)
+        self.steps = 0
+
+    def reset(self):
+        """Start a new episode, reusing the same buffers"""
+        self.actions[:self.steps] = NO_ACTION
+        self.capturing_chaser[:self.steps] = -1
+        self.steps = 0
+
+    def record(self, runners, chasers, chaser_pos, visited_cells, rewards, capturing_chaser=None):
+        """Store one step. chaser_pos is the (M, 2) array already built for mark_visited"""
+        t = self.steps
+        if t >= self.max_steps:
+            raise IndexError(f"StepRecorder is full ({self.max_steps} steps)")
+        for j, runner in enumerate(runners):
+            self.runner_pos[t, j] = (runner.pos.x, runner.pos.y)
+        self.chaser_pos[t] = chaser_pos
+        for i, chaser in enumerate(chasers):
+            self.modes[t, i] = MODE_CODES[chaser.mode]
+            if chaser.last_action is not None:
+                self.actions[t, i] = chaser.last_action
+        self.rewards[t] = rewards
+        self.visited_cells[t] = visited_cells
+        if capturing_chaser is not None:
+            self.captured[t] = True
+            self.capturing_chaser[t] = capturing_chaser
+        else:
+            self.captured[t] = False
+        self.steps = t + 1
+
+    def columns(self):
+        n = self.steps
+        return {
+            'runner_pos': self.runner_pos[:n],
+            'chaser_pos': self.chaser_pos[:n],
+            'modes': self.modes[:n],
+            'actions': self.actions[:n],
+            'rewards': self.rewards[:n],
+            'captured': self.captured[:n],
+            'capturing_chaser': self.capturing_chaser[:n],
+            'visited_cells': self.visited_cells[:n],
+        }
+
+    def save(self, path, **metadata):
+        """Write the episode as a compressed .npz; metadata is stored as extra scalar arrays"""
+        np.savez_compressed(path, **self.columns(), **{k: np.asarray(v) for k, v in metadata.items()})
+
+
+def load_trace(path):
+    """Load a saved trace as a dict of arrays"""
+    with np.load(path) as data:
+        return {k: data[k] for k in data.files}
+
+
+def exploration_map_at(trace, step, cols, rows):
+    """Visit counts (cols, rows) after the given step, rebuilt from visited_cells"""
+    cells = trace['visited_cells'][:step + 1].ravel()
+    cells = cells[cells >= 0]
+    return np.bincount(cells, minlength=cols * rows).reshape(cols, rows).astype(np.int32)
@@ -0,0 +1,199 @@
+import numpy as np
+from utils.params import (WIDTH, HEIGHT, BORDER_MARGIN, SENSE_RADIUS, CHASER_SPACING, CHASER_SPEED,
+                          RUNNER_MAX_SPEED, RUNNER_STEERING_STRENGTH, RUNNER_SMOOTHNESS)
+from utils.config import ArenaConfig, ChaserConfig
+
+# Integer mode codes used in SwarmState.mode
+EXPLORATION = 0
+PURSUIT = 1
+MODE_NAMES = {EXPLORATION: "exploration", PURSUIT: "pursuit"}
+MODE_CODES = {name: code for code, name in MODE_NAMES.items()}
+
+
+class SwarmState:
+    """Struct-of-arrays state for a group of drones (one row per drone)"""
+    def __init__(self, pos, vel, target_vel=None, mode=None):
+        self.pos = np.array(pos, dtype=np.float64).reshape(-1, 2)
+        self.vel = np.array(vel, dtype=np.float64).reshape(-1, 2)
+        if target_vel is None:
+            target_vel = self.vel
+        self.target_vel = np.array(target_vel, dtype=np.float64).reshape(-1, 2)
+        n = len(self.pos)
+        self.mode = np.zeros(n, dtype=np.int8) if mode is None else np.array(mode, dtype=np.int8)
+        # Per-drone cooldown and last known runner position (NaN = unknown)
+        self.cooldown = np.zeros(n, dtype=np.int32)
+        self.last_runner_pos = np.full((n, 2), np.nan)
+
+    def __len__(self):
+        return len(self.pos)
+
+    @classmethod
+    def random(cls, n, rng, width=WIDTH, height=HEIGHT, margin=BORDER_MARGIN):
+        """Spawn n drones uniformly inside the borders with small random velocities"""
+        pos = np.column_stack([rng.uniform(margin, width - margin, n),
+                               rng.uniform(margin, height - margin, n)])
+        vel = _normalize(rng.uniform(-1, 1, (n, 2))) * 0.5
+        return cls(pos, vel)
+
+    @classmethod
+    def from_entities(cls, entities):
+        """Gather pygame.Vector2 based entities (Runner, Chaser, ChaserIntelligent)"""
+        state = cls([(e.pos.x, e.pos.y) for e in entities],
+                    [(e.velocity.x, e.velocity.y) for e in entities],
+                    [(e.target_velocity.x, e.target_velocity.y) for e in entities],
+                    [MODE_CODES.get(getattr(e, "mode", "exploration"), EXPLORATION) for e in entities])
+        for i, e in enumerate(entities):
+            state.cooldown[i] = getattr(e, "switch_cooldown", 0)
+            last = getattr(e, "last_runner_pos", None)
+            if last:
+                state.last_runner_pos[i] = (last.x, last.y)
+        return state
+
+    def to_entities(self, entities):
+        """Write positions, velocities and modes back to the entity objects"""
+        for i, e in enumerate(entities):
+            e.pos.update(*self.pos[i])
+            e.velocity.update(*self.vel[i])
+            e.target_velocity.update(*self.target_vel[i])
+            if hasattr(e, "mode"):
+                e.mode = MODE_NAMES[int(self.mode[i])]
+
+
+def _normalize(v):
+    """Row-wise normalize, leaving zero rows untouched"""
+    norm = np.linalg.norm(v, axis=1, keepdims=True)
+    return np.divide(v, norm, out=np.zeros_like(v), where=norm > 0)
+
+
+def _rotate(v, degrees):
+    """Rotate each row by its angle, same convention as pygame.Vector2.rotate"""
+    rad = np.radians(degrees)
+    c, s = np.cos(rad), np.sin(rad)
+    return np.column_stack([v[:, 0] * c - v[:, 1] * s, v[:, 0] * s + v[:, 1] * c])
+
+
+def _reflect_target(state, mask, width, height, margin):
+    """Point target velocities back inside when a drone is past the border margin"""
+    tv, pos = state.target_vel, state.pos
+    for axis, limit in ((0, width), (1, height)):
+        lo = mask & (pos[:, axis] < margin)
+        hi = mask & (pos[:, axis] > limit - margin)
+        tv[lo, axis] = np.abs(tv[lo, axis])
+        tv[hi, axis] = -np.abs(tv[hi, axis])
+
+
+def _wander(state, mask, rng, prob, sigma, smoothness, max_speed):
+    """With probability prob, turn target velocity by a Gaussian angle"""
+    turn = mask & (rng.random(len(state)) < prob)
+    if turn.any():
+        angles = rng.normal(0, sigma, turn.sum()) * (1 - smoothness)
+        state.target_vel[turn] = _normalize(_rotate(state.target_vel[turn], angles)) * max_speed
+
+
+def pairwise_offsets(pos):
+    """Offsets pos[i] - pos[j] per axis and their squared lengths for every pair"""
+    dx = pos[:, None, 0] - pos[None, :, 0]
+    dy = pos[:, None, 1] - pos[None, :, 1]
+    return dx, dy, dx * dx + dy * dy
+
+
+def repulsion(pairwise, radius, rows):
+    """Sum of offset / dist**2 from every other drone closer than radius, for the given rows"""
+    dx, dy, dist_sq = (a[rows] for a in pairwise)
+    near = (dist_sq > 0) & (dist_sq < radius * radius)
+    inv = np.divide(1.0, dist_sq, out=np.zeros_like(dist_sq), where=near)
+    return np.column_stack([(dx * inv).sum(axis=1), (dy * inv).sum(axis=1)])
+
+
+def step_runners(state, rng, max_speed=RUNNER_MAX_SPEED, steering_strength=RUNNER_STEERING_STRENGTH,
+                 smoothness=RUNNER_SMOOTHNESS, width=WIDTH, height=HEIGHT, margin=BORDER_MARGIN):
+    """Batched Runner.update_random"""
+    everyone = np.ones(len(state), dtype=bool)
+    _wander(state, everyone, rng, 0.5, 15, smoothness, max_speed)
+    state.vel += (state.target_vel - state.vel) * steering_strength
+    _reflect_target(state, everyone, width, height, margin)
+    state.pos += state.vel
+
+
+def apply_steering(state, config=None, arena=None):
+    """Batched ChaserIntelligent._apply_steering followed by _enforce_bounds"""
+    config = config or ChaserConfig()
+    arena = arena or ArenaConfig()
+    margin = config.border_margin
+    state.vel += (state.target_vel - state.vel) * config.steering_strength
+    state.pos += state.vel
+    for axis, limit in ((0, arena.width), (1, arena.height)):
+        lo = state.pos[:, axis] < margin
+        hi = state.pos[:, axis] > limit - margin
+        state.pos[lo, axis] = margin
+        state.pos[hi, axis] = limit - margin
+        state.vel[lo | hi, axis] *= -config.bounce
+
+
+def step_intelligent_chasers(state, runner_pos, explore_targets, config=None, arena=None):
+    """Batched ChaserIntelligent.update movement for a single runner.
+
+    The whole swarm switches to pursuit when any chaser sees the runner
+    (subject to each chaser's cooldown); the rest steer toward their
+    explore_targets, which the caller keeps up to date. config and arena
+    are the ChaserConfig and ArenaConfig (defaults when None).
+    """
+    config = config or ChaserConfig()
+    arena = arena or ArenaConfig()
+    runner_pos = np.asarray(runner_pos, dtype=np.float64)
+    to_runner = runner_pos - state.pos
+    swarm_sees_runner = (np.einsum("ij,ij->i", to_runner, to_runner) <= arena.sense_radius ** 2).any()
+
+    ready = state.cooldown <= 0
+    if swarm_sees_runner:
+        state.mode[ready] = PURSUIT
+        state.cooldown[ready] = config.pursuit_cooldown
+    else:
+        state.mode[ready] = EXPLORATION
+
+    max_speed = config.max_speed
+    pursuit = state.mode == PURSUIT
+    state.target_vel[pursuit] = _normalize(to_runner[pursuit]) * max_speed * config.pursuit_speed
+    explore = ~pursuit
+    to_target = explore_targets[explore] - state.pos[explore]
+    state.target_vel[explore] = _normalize(to_target) * max_speed * config.explore_speed
+    apply_steering(state, config, arena)
+    state.cooldown -= 1
+
+
+def step_hybrid_chasers(state, runner_pos, rng, sense_radius=SENSE_RADIUS, spacing=CHASER_SPACING,
+                        max_speed=CHASER_SPEED, steering_strength=0.05, wander_smoothness=0.7,
+                        width=WIDTH, height=HEIGHT, margin=BORDER_MARGIN):
+    """Batched Chaser.update_hybrid_1 for a single runner.
+
+    Chasers that see the runner share its position with every chaser not
+    already in pursuit, then all chasers move simultaneously.
+    """
+    runner_pos = np.asarray(runner_pos, dtype=np.float64)
+    to_runner = runner_pos - state.pos
+    visible = np.einsum("ij,ij->i", to_runner, to_runner) <= sense_radius ** 2
+    if visible.any():
+        state.last_runner_pos[visible] = runner_pos
+        told = ~visible & (state.mode != PURSUIT)
+        state.last_runner_pos[told] = runner_pos
+        state.mode[:] = PURSUIT
+
+    pursuit = (state.mode == PURSUIT) & ~np.isnan(state.last_runner_pos[:, 0])
+    explore = state.mode != PURSUIT
+    pairwise = pairwise_offsets(state.pos)
+
+    if pursuit.any():
+        direction = _normalize(state.last_runner_pos[pursuit] - state.pos[pursuit])
+        rep = repulsion(pairwise, spacing, pursuit)
+        combined = direction * max_speed + rep * 100
+        state.vel[pursuit] += (combined - state.vel[pursuit]) * steering_strength
+
+    if explore.any():
+        _wander(state, explore, rng, 0.1, 20, wander_smoothness, max_speed)
+        rep = repulsion(pairwise, sense_radius, explore)
+        steer = state.target_vel[explore] + rep * 100
+        state.vel[explore] += (steer - state.vel[explore]) * steering_strength
+        _reflect_target(state, explore, width, height, margin)
+
+    moving = pursuit | explore
+    state.pos[moving] += state.vel[moving]
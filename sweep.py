@@ -0,0 +1,168 @@
+import argparse
+import contextlib
+import glob
+import itertools
+import json
+import math
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from utils.config import add_config_args, load_config, apply_overrides, to_dict
+
+SEED_STRIDE = 100_000  # base seeds of two replicates are this far apart, so their episode seeds never overlap
+
+
+def grid(params):
+    """Every combination of {"section.key": [values]} as lists of "section.key=value" overrides"""
+    keys = list(params)
+    return [[f"{k}={v}" for k, v in zip(keys, values)]
+            for values in itertools.product(*(params[k] for k in keys))]
+
+
+def parse_param(text):
+    """"agent.lr=1e-3,3e-4" -> ("agent.lr", ["1e-3", "3e-4"])"""
+    key, sep, values = text.partition('=')
+    if not sep or not values:
+        raise argparse.ArgumentTypeError(f"expected section.key=v1,v2,..., not {text!r}")
+    return key.strip(), [v.strip() for v in values.split(',')]
+
+
+def episode_stats(log_dir):
+    """Capture rate, mean episode length, coverage, mean reward and episode count from log_dir's metrics"""
+    paths = sorted(glob.glob(os.path.join(log_dir, "metrics_*.npz")))
+    if not paths:
+        return {'capture_rate': 0.0, 'mean_steps': float('inf'), 'coverage': 0.0, 'mean_reward': float('nan'),
+                'episodes': 0}
+    with np.load(paths[-1]) as m:
+        captures, steps, coverage, rewards = (m['capture_success'], m['steps'], m['explored_percentage'],
+                                              m['total_reward'])
+    return {'capture_rate': float(captures.mean()), 'mean_steps': float(steps.mean()),
+            'coverage': float(coverage.mean()), 'mean_reward': float(rewards.mean()), 'episodes': len(captures)}
+
+
+def score(stats):
+    """Ranking key, higher is better: capture rate, then faster episodes, then map coverage.
+
+    Mean reward is not used: chasers only produce transitions (and reward)
+    while pursuing, so a run that never pursued scores 0 and would outrank
+    runs that pursued and paid the exploration penalties.
+    """
+    return stats['capture_rate'], -stats['mean_steps'], stats['coverage']
+
+
+def run_trial(base_config, overrides, seed, run_dir, episodes, rung, threads=1):
+    """Train one configuration headless up to `episodes` in total (a worker process job).
+
+    Rung 0 starts from scratch, later rungs resume from the run's latest
+    full snapshot. Each rung logs to run_dir/rung_<k>/ and the episode
+    printout goes to run_dir/stdout.log. Returns the rung's episode stats
+    and wall-clock seconds.
+    """
+    from main_rl import main  # imported in the worker, so the parent never loads torch
+    config = apply_overrides(base_config, overrides)
+    config.train.episodes = episodes
+    if config.agent.num_threads is None:
+        config.agent.num_threads = threads
+    log_dir = os.path.join(run_dir, f"rung_{rung}")
+    os.makedirs(log_dir, exist_ok=True)
+    start = time.time()
+    with open(os.path.join(run_dir, "stdout.log"), 'a') as out, contextlib.redirect_stdout(out):
+        main(config, headless=True, log_dir=log_dir, seed=seed, checkpoint_dir=os.path.join(run_dir, "model"),
+             resume="latest" if rung > 0 else None)
+    return {**episode_stats(log_dir), 'seconds': time.time() - start}
+
+
+def successive_halving(base_config, configs, sweep_dir, seeds=1, base_seed=0, min_episodes=20, eta=3, rungs=3,
+                       workers=None, threads=1):
+    """Train every config for min_episodes, keep the best 1/eta, train those eta times longer, and so on.
+
+    configs is a list of override lists. Each (config, seed) pair is one
+    run with its own log and checkpoint directory under sweep_dir.
+    Replicate s of every config uses seed base_seed + s * SEED_STRIDE, so
+    all configs are compared on the same episodes. Configs are ranked by
+    score() over the episodes of the latest rung, averaged across seeds.
+    All runs of a rung go through one process pool queue. Returns one
+    summary row per run.
+    """
+    runs = []
+    for c, overrides in enumerate(configs):
+        for s in range(seeds):
+            i = len(runs)
+            runs.append({'run': i, 'config': c, 'overrides': overrides, 'seed': base_seed + s * SEED_STRIDE,
+                         'dir': os.path.join(sweep_dir, f"run_{i:03d}"), 'rung': -1, 'episodes': 0,
+                         'capture_rate': 0.0, 'mean_steps': float('inf'), 'coverage': 0.0,
+                         'mean_reward': float('nan'), 'seconds': 0.0})
+    alive = list(range(len(configs)))
+    ctx = mp.get_context("spawn")  # torch and fork do not mix
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        for rung in range(rungs):
+            episodes = min_episodes * eta ** rung
+            jobs = {pool.submit(run_trial, base_config, r['overrides'], r['seed'], r['dir'], episodes, rung,
+                                threads): r
+                    for r in runs if r['config'] in alive}
+            for future in as_completed(jobs):
+                r = jobs[future]
+                stats = future.result()
+                r.update(rung=rung, episodes=episodes, capture_rate=stats['capture_rate'],
+                         mean_steps=stats['mean_steps'], coverage=stats['coverage'],
+                         mean_reward=stats['mean_reward'], seconds=r['seconds'] + stats['seconds'])
+                print(f"rung {rung} run {r['run']:03d} {' '.join(r['overrides']) or '(base)'}: "
+                      f"capture rate {r['capture_rate']:.2f}, {stats['seconds']:.0f}s")
+
+            if rung == rungs - 1:
+                break
+            scores = {c: np.mean([score(r) for r in runs if r['config'] == c], axis=0) for c in alive}
+            alive.sort(key=lambda c: tuple(scores[c]), reverse=True)
+            alive = alive[:max(1, math.ceil(len(alive) / eta))]
+    return runs
+
+
+def summary_table(runs):
+    """Runs sorted by rung reached, then score(), as aligned text"""
+    rows = sorted(runs, key=lambda r: (r['rung'], *score(r)), reverse=True)
+    lines = [f"{'run':>4} {'rung':>4} {'episodes':>8} {'capture':>8} {'steps':>7} {'explored':>8} {'reward':>9} "
+             f"{'wall s':>8}  overrides"]
+    for r in rows:
+        lines.append(f"{r['run']:>4} {r['rung']:>4} {r['episodes']:>8} {r['capture_rate']:>8.2f} "
+                     f"{r['mean_steps']:>7.0f} {r['coverage']:>8.2f} {r['mean_reward']:>9.2f} {r['seconds']:>8.1f}  "
+                     f"{' '.join(r['overrides']) or '(base)'}")
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Grid sweep over main_rl training runs in a process pool, pruned by successive halving",
+        epilog='example: python sweep.py --param agent.gamma=0.95,0.99 --param agent.lr=1e-3,3e-4 '
+               '--param arena.sense_radius=300,400 --workers 64')
+    parser.add_argument("--param", type=parse_param, action="append", default=[], metavar="SECTION.KEY=V1,V2",
+                        help="config values to sweep (repeatable; the grid is their product)")
+    add_config_args(parser)  # base config and fixed overrides shared by every run
+    parser.add_argument("--seeds", type=int, default=1, help="runs per configuration, each with its own seed")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="base seed; replicate s of every config uses seed + s * SEED_STRIDE")
+    parser.add_argument("--min-episodes", type=int, default=20, help="episodes per run in the first rung")
+    parser.add_argument("--eta", type=int, default=3, help="keep 1/eta of the configs and train eta times longer")
+    parser.add_argument("--rungs", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--threads", type=int, default=1, help="torch threads per run")
+    parser.add_argument("--out-dir", default=os.path.join("sweeps", time.strftime("%Y%m%d-%H%M%S")))
+    args = parser.parse_args()
+
+    base_config = load_config(args.config, args.overrides)
+    configs = grid(dict(args.param))
+    for overrides in configs:
+        apply_overrides(base_config, overrides)  # fail on a bad key before starting any run
+    os.makedirs(args.out_dir, exist_ok=True)
+    print(f"{len(configs)} configs x {args.seeds} seeds, {args.rungs} rungs, output in {args.out_dir}")
+
+    runs = successive_halving(base_config, configs, args.out_dir, args.seeds, args.seed, args.min_episodes,
+                              args.eta, args.rungs, args.workers, args.threads)
+    table = summary_table(runs)
+    print(table)
+    with open(os.path.join(args.out_dir, "summary.txt"), 'w') as f:
+        f.write(table + '\n')
+    with open(os.path.join(args.out_dir, "summary.json"), 'w') as f:
+        json.dump({'base_config': to_dict(base_config), 'runs': runs}, f, indent=2)
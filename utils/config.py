@@ -0,0 +1,162 @@
+"""Typed run configuration: arena, entities, rewards, agent and training loop.
+
+The defaults reproduce the hard-coded behaviour (utils/params.py plus the
+values that used to live in the classes). A config is built once per run
+with load_config() and passed down explicitly, so nothing is read from
+disk or the environment at import time and every worker of a sweep can
+run its own config in the same code.
+"""
+import ast
+import dataclasses
+import json
+from dataclasses import dataclass, field
+from typing import Optional
+from utils.params import (WIDTH, HEIGHT, BORDER_MARGIN, SENSE_RADIUS, RUNNER_MAX_SPEED, RUNNER_STEERING_STRENGTH,
+                          RUNNER_SMOOTHNESS)
+
+
+@dataclass
+class ArenaConfig:
+    width: int = WIDTH
+    height: int = HEIGHT
+    sense_radius: float = SENSE_RADIUS
+    cell_size: int = 30  # exploration grid cell, in pixels
+    border_margin: int = BORDER_MARGIN  # runners turn back this close to a wall
+    frontier_margin: int = 20  # chaser explore targets stay this far inside the walls
+
+
+@dataclass
+class RunnerConfig:
+    radius: int = 15
+    max_speed: float = RUNNER_MAX_SPEED
+    steering_strength: float = RUNNER_STEERING_STRENGTH  # lower = smoother turns
+    smoothness: float = RUNNER_SMOOTHNESS  # 0-1, higher = smoother direction changes
+
+
+@dataclass
+class ChaserConfig:
+    radius: int = 15
+    speed: float = 2.5
+    max_speed: float = 3.5
+    steering_strength: float = 0.08
+    pursuit_speed: float = 1.2  # fraction of max_speed when chasing
+    explore_speed: float = 0.8  # fraction of max_speed when exploring
+    explore_radius: float = 300  # frontier cells are picked within this ring...
+    explore_min_radius: float = 50  # ...and at least this far away
+    arrival_radius: float = 15  # an explore target this close counts as reached
+    border_margin: int = 15
+    bounce: float = 0.8
+    pursuit_cooldown: int = 30  # ticks a chaser stays in pursuit after seeing the runner
+    join_cooldown: int = 15  # ticks a chaser pulled into pursuit by the swarm stays there
+    formation_radius: float = 500
+
+
+@dataclass
+class RewardConfig:
+    visit_penalty: float = 0.1  # per visit of the chaser's current cell
+    step_penalty: float = 0.01
+    capture_bonus: float = 100.0
+    cooperative_bonus: float = 20.0  # to the other pursuing chasers on a capture
+
+
+@dataclass
+class AgentConfig:
+    """Keyword arguments of RLAgent (RLAgent(state_dim, action_dim, **asdict(agent)))"""
+    lr: float = 1e-3
+    gamma: float = 0.99
+    epsilon: float = 1.0
+    epsilon_min: float = 0.1
+    epsilon_decay: float = 0.995
+    buffer_size: int = 10000
+    batch_size: int = 64
+    grad_steps: int = 1
+    tau: float = 0.01
+    prioritized: bool = False
+    num_threads: Optional[int] = None
+    bf16: bool = False
+
+
+@dataclass
+class TrainConfig:
+    episodes: int = 1000
+    max_steps: int = 1000
+    checkpoint_every: int = 50
+    keep_last: int = 3
+    render_fps: int = 60
+
+
+@dataclass
+class Config:
+    arena: ArenaConfig = field(default_factory=ArenaConfig)
+    runner: RunnerConfig = field(default_factory=RunnerConfig)
+    chaser: ChaserConfig = field(default_factory=ChaserConfig)
+    reward: RewardConfig = field(default_factory=RewardConfig)
+    agent: AgentConfig = field(default_factory=AgentConfig)
+    train: TrainConfig = field(default_factory=TrainConfig)
+
+
+def to_dict(config):
+    return dataclasses.asdict(config)
+
+
+def from_dict(data, cls=Config):
+    """Build a (nested) config dataclass from a dict; unknown keys raise ValueError"""
+    data = dict(data or {})
+    kwargs = {}
+    for f in dataclasses.fields(cls):
+        if f.name not in data:
+            continue
+        value = data.pop(f.name)
+        kwargs[f.name] = from_dict(value, f.type) if dataclasses.is_dataclass(f.type) else value
+    if data:
+        raise ValueError(f"unknown {cls.__name__} keys: {', '.join(sorted(data))}")
+    return cls(**kwargs)
+
+
+def _parse_value(text):
+    """Python/JSON literal if it parses as one (3e-4, true, None, [1, 2]), else the raw string"""
+    lowered = text.strip().lower()
+    if lowered in ('true', 'false', 'null', 'none'):
+        return {'true': True, 'false': False}.get(lowered)
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def apply_overrides(config, overrides):
+    """Return a copy of config with dotted "section.key=value" overrides applied"""
+    data = to_dict(config)
+    for item in overrides:
+        key, sep, text = item.partition('=')
+        section, dot, name = key.strip().partition('.')
+        if not sep or not dot:
+            raise ValueError(f"override must look like section.key=value, not {item!r}")
+        if section not in data or name not in data[section]:
+            raise ValueError(f"unknown config key {key.strip()!r}")
+        data[section][name] = _parse_value(text)
+    return from_dict(data)
+
+
+def load_config(path=None, overrides=()):
+    """Defaults, updated from a JSON or YAML file (YAML needs PyYAML), then from overrides"""
+    data = {}
+    if path:
+        with open(path) as f:
+            if path.endswith(('.yaml', '.yml')):
+                import yaml
+                data = yaml.safe_load(f) or {}
+            else:
+                data = json.load(f)
+    return apply_overrides(from_dict(data), overrides)
+
+
+def save_config(config, path):
+    with open(path, 'w') as f:
+        json.dump(to_dict(config), f, indent=2)
+
+
+def add_config_args(parser):
+    parser.add_argument("--config", default=None, help="JSON or YAML run config (defaults otherwise)")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="SECTION.KEY=VALUE",
+                        help="override one config value, e.g. --set agent.lr=3e-4 (repeatable)")
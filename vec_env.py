@@ -0,0 +1,160 @@
+import argparse
+import time
+import numpy as np
+from chaser_rl import RLAgent
+from dataclasses import asdict
+from main_rl import initialize_simulation, simulate_step, compute_rewards, has_transition
+from utils.config import Config, add_config_args, load_config
+
+
+class _Episode:
+    """One running pursuit episode inside a VecDroneEnv"""
+    def __init__(self, rl_agent, seed=None, config=None, num_chasers=3):
+        self.env, self.runner, self.chasers = initialize_simulation(rl_agent, seed, config, num_chasers)
+        self.seed = seed
+        self.steps = 0
+        self.total_reward = 0.0
+        self.mode_switches = 0
+
+    def observe(self):
+        return self.env.get_states(self.chasers, self.runner)
+
+    def step(self, states, actions, rewards, next_states, valid):
+        """Advance one tick (same rules as main_rl.main) and fill this episode's rows"""
+        env, runner, chasers = self.env, self.runner, self.chasers
+        _, capturing_index, mode_switches = simulate_step(env, runner, chasers)
+        self.mode_switches += mode_switches
+        captured = capturing_index is not None
+
+        next_states[:] = env.get_states(chasers, runner)
+        step_rewards = compute_rewards(env, runner, chasers, capturing_index)
+        for i, chaser in enumerate(chasers):
+            if not has_transition(chaser):
+                continue
+            reward = step_rewards[i]
+            states[i] = chaser.last_state
+            actions[i] = chaser.last_action
+            rewards[i] = reward
+            valid[i] = True
+            self.total_reward += reward
+
+        self.steps += 1
+        return captured
+
+
+class VecDroneEnv:
+    """K independent pursuit episodes stepped in lockstep.
+
+    Finished episodes (capture or max_steps) are reset automatically. Chasers
+    are driven by ChaserIntelligent, so the actions they took are reported in
+    the step info rather than passed in. With a seed, the n-th episode
+    started by this env is simulated from seed + n. max_steps defaults to
+    config.train.max_steps. Each episode has num_chasers chasers.
+    """
+    def __init__(self, num_envs, rl_agent, max_steps=None, num_chasers=3, state_dim=9, seed=None, config=None):
+        self.config = config or Config()
+        self.num_envs = num_envs
+        self.rl_agent = rl_agent
+        self.max_steps = max_steps or self.config.train.max_steps
+        self.num_chasers = num_chasers
+        self.state_dim = state_dim
+        self.episodes = [None] * num_envs
+        self.seed = seed
+        self.started = 0
+
+    def _new_episode(self):
+        seed = None if self.seed is None else self.seed + self.started
+        self.started += 1
+        return _Episode(self.rl_agent, seed, self.config, self.num_chasers)
+
+    def reset(self):
+        self.episodes = [self._new_episode() for _ in range(self.num_envs)]
+        return np.stack([ep.observe() for ep in self.episodes])
+
+    def step(self):
+        """Step every episode once.
+
+        Returns (obs, rewards, dones, info). obs is (K, M, state_dim) and is
+        already the first observation of the new episode where dones is set.
+        info holds the stacked transitions ('states', 'actions', 'rewards',
+        'next_states', 'captured', 'valid') and a list of finished 'episodes'.
+        """
+        shape = (self.num_envs, self.num_chasers)
+        states = np.zeros(shape + (self.state_dim,), dtype=np.float32)
+        next_states = np.zeros_like(states)
+        actions = np.zeros(shape, dtype=np.int64)
+        rewards = np.zeros(shape, dtype=np.float32)
+        valid = np.zeros(shape, dtype=bool)
+        captured = np.zeros(self.num_envs, dtype=bool)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        obs = np.empty_like(states)
+        finished = []
+
+        for k, ep in enumerate(self.episodes):
+            captured[k] = ep.step(states[k], actions[k], rewards[k], next_states[k], valid[k])
+            dones[k] = captured[k] or ep.steps >= self.max_steps
+            if dones[k]:
+                finished.append({
+                    'env': k,
+                    'total_reward': ep.total_reward,
+                    'steps': ep.steps,
+                    'capture_success': int(captured[k]),
+                    'mode_switches': ep.mode_switches,
+                    'seed': ep.seed,
+                })
+                ep = self.episodes[k] = self._new_episode()
+                obs[k] = ep.observe()
+            else:
+                obs[k] = next_states[k]
+
+        info = {
+            'states': states,
+            'actions': actions,
+            'rewards': rewards,
+            'next_states': next_states,
+            'captured': captured,
+            'valid': valid,
+            'episodes': finished,
+        }
+        return obs, rewards, dones, info
+
+
+def store_transitions(rl_agent, info):
+    """Insert all valid transitions of one VecDroneEnv.step in a single call"""
+    valid = info['valid']
+    dones = np.broadcast_to(info['captured'][:, None], valid.shape)
+    rl_agent.store_experiences(info['states'][valid], info['actions'][valid], info['rewards'][valid],
+                               info['next_states'][valid], dones[valid].astype(np.float32))
+    return int(valid.sum())
+
+
+def main(num_envs=8, num_episodes=100, seed=None, config=None):
+    config = config or Config()
+    rl_agent = RLAgent(state_dim=9, action_dim=8, seed=seed, **asdict(config.agent))
+    vec_env = VecDroneEnv(num_envs, rl_agent, seed=seed, config=config)
+    vec_env.reset()
+
+    completed = 0
+    env_steps = 0
+    start = time.time()
+    while completed < num_episodes:
+        _, _, _, info = vec_env.step()
+        store_transitions(rl_agent, info)
+        rl_agent.train()
+        env_steps += num_envs
+        for ep in info['episodes']:
+            completed += 1
+            print(f"Episode {completed}, Reward: {ep['total_reward']:.2f}, Epsilon: {rl_agent.epsilon:.2f}")
+
+    elapsed = time.time() - start
+    print(f"{env_steps} env steps in {elapsed:.1f}s ({env_steps / elapsed:.0f} steps/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect experience from K pursuit episodes in lockstep")
+    parser.add_argument("--num-envs", type=int, default=8)
+    parser.add_argument("--episodes", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None)
+    add_config_args(parser)
+    args = parser.parse_args()
+    main(args.num_envs, args.episodes, args.seed, load_config(args.config, args.overrides))